@@ -6,16 +6,15 @@ from sqlalchemy import pool
 from alembic import context
 
 # Add these imports
-from app.models.base import Base
-from app.models.user import User  # Import all models
-from app.models.report import Report  # Add this line
-from app.core.database import DATABASE_URL
+from app.db.base_class import Base
+import app.models  # noqa: F401 - registers every model on Base.metadata
+from app.core.config import settings
 
 # this is the Alembic Config object
 config = context.config
 
 # Update database URL from our environment
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
@@ -1,77 +1,215 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 import logging
 
-from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principal_cache import principal_cache
+from app.core.security import decode_token
+from app.db.session import get_sessionmaker
+from app.models.chapter import Chapter
+from app.models.generation_job import GenerationJob
+from app.models.reference import Reference
+from app.models.report import Report
+from app.models.section import Section
 from app.models.user import User
+from app.services.autosave import autosave_buffer
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Use HTTPBearer instead of OAuth2PasswordBearer
 security = HTTPBearer()
 
-def get_db() -> Generator:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Get database session.
+    Get async database session.
     """
     db = None
     try:
-        db = SessionLocal()
+        db = get_sessionmaker()()
         logger.debug("Created new database session")
         yield db
     except Exception as e:
         logger.error(f"Database session error: {str(e)}")
+        if db:
+            await db.rollback()
         raise
     finally:
         if db:
             logger.debug("Closing database session")
-            db.close()
+            await db.close()
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: HTTPBearer = Depends(security)
 ) -> User:
     """
-    Get current user from JWT token
+    Get current user from JWT token.
+    The token is verified on every request; the user row is served from the
+    principal cache when possible, so most requests skip the users SELECT.
+    The returned User is detached: endpoints that modify it must
+    `await db.merge(current_user, load=False)` first.
     """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
     try:
         logger.debug("Authenticating user from token")
-        
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-        
+
         try:
             # Use token.credentials to get the actual token string
-            payload = jwt.decode(
-                token.credentials,
-                settings.SECRET_KEY,
-                algorithms=[settings.ALGORITHM]
-            )
+            payload = decode_token(token.credentials)
             user_id: str = payload.get("sub")
             if user_id is None:
                 logger.error("Token missing sub claim")
                 raise credentials_exception
-        except JWTError as e:
-            logger.error(f"JWT decode error: {str(e)}")
+            subject = str(UUID(user_id))
+        except (JWTError, ValueError) as e:
+            logger.error(f"Invalid token: {str(e)}")
             raise credentials_exception
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = principal_cache.get(subject)
         if user is None:
-            logger.error(f"User not found: {user_id}")
-            raise credentials_exception
+            result = await db.execute(select(User).where(User.id == subject))
+            user = result.scalar_one_or_none()
+            if user is None:
+                logger.error(f"User not found: {subject}")
+                raise credentials_exception
+            # Detach it so the cached instance is never flushed or expired by a request session
+            db.expunge(user)
+            principal_cache.put(subject, user)
+
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user"
+            )
+
+        # Lets the session start the read-your-writes window after a commit
+        db.info["user_id"] = user.id
 
         logger.debug(f"Successfully authenticated user: {user.id}")
         return user
-        
+
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
         raise
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> AsyncSession:
+    """
+    Get async database session for read-only endpoints.
+    Queries go to the read replica when one is configured, unless the
+    current user committed a write within READ_YOUR_WRITES_SECONDS.
+    This is the request's own session (already used to authenticate), so a
+    request never holds two primary connections at once.
+    """
+    db.info["use_replica"] = True
+    return db
+
+def query_budget(max_queries: int):
+    """
+    Declare how many SQL statements a route may issue, authentication included.
+    Use as `dependencies=[deps.query_budget(5)]`; the request middleware
+    compares the actual count against it and reports regressions.
+    """
+    def set_query_budget(request: Request) -> None:
+        request.state.query_budget = max_queries
+
+    return Depends(set_query_budget)
+
+async def flush_autosaves(current_user: User = Depends(get_current_user)) -> None:
+    """
+    Write the current user's buffered autosaves before the route runs, so
+    reads and other writes never see content older than the last autosave.
+    Use as `dependencies=[Depends(deps.flush_autosaves)]`; free when nothing
+    is pending.
+    """
+    await autosave_buffer.flush_user(current_user.id)
+
+async def _get_owned(db: AsyncSession, statement, current_user: User, name: str):
+    """
+    Run a `select(Entity, Report.user_id)` ownership query and check the owner.
+    The entity and its report's owner come back in one round trip, so no
+    relationship has to be loaded just to authorize the request.
+    """
+    row = (await db.execute(statement)).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{name} not found")
+    entity, owner_id = row
+    if owner_id != current_user.id:
+        logger.warning(f"User {current_user.id} denied access to {name.lower()} {entity.id}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Not authorized to access this {name.lower()}")
+    return entity
+
+def _owned_section_statement(section_id: UUID, with_report: bool = False):
+    statement = (
+        select(Section, Report.user_id)
+        .join(Chapter, Section.chapter_id == Chapter.id)
+        .join(Report, Chapter.report_id == Report.id)
+        .where(Section.id == section_id)
+    )
+    if with_report:
+        statement = statement.options(joinedload(Section.chapter).joinedload(Chapter.report))
+    return statement
+
+def _owned_reference_statement(reference_id: UUID):
+    return (
+        select(Reference, Report.user_id)
+        .join(Report, Reference.report_id == Report.id)
+        .where(Reference.id == reference_id)
+    )
+
+async def get_owned_section(
+    section_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Section:
+    """Get the section in the path, 404 if it does not exist, 403 if it belongs to another user"""
+    return await _get_owned(db, _owned_section_statement(section_id), current_user, "Section")
+
+async def get_owned_section_with_report(
+    section_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Section:
+    """Same as get_owned_section, with section.chapter.report loaded in the same query"""
+    return await _get_owned(db, _owned_section_statement(section_id, with_report=True), current_user, "Section")
+
+async def get_owned_section_for_read(
+    section_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> Section:
+    """Same as get_owned_section, on the read (replica-routed) session"""
+    return await _get_owned(db, _owned_section_statement(section_id), current_user, "Section")
+
+async def get_owned_generation_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> GenerationJob:
+    """
+    Get the generation job in the path, checking ownership. Reads the
+    primary: workers update jobs from other sessions, so a replica would lag
+    behind the status being polled.
+    """
+    statement = select(GenerationJob, GenerationJob.user_id).where(GenerationJob.id == job_id)
+    return await _get_owned(db, statement, current_user, "Generation job")
+
+async def get_owned_reference_for_read(
+    reference_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> Reference:
+    """Get the reference in the path on the read session, checking ownership"""
+    return await _get_owned(db, _owned_reference_statement(reference_id), current_user, "Reference")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import user, report, sections, references
+from app.api.v1.endpoints import user, report, sections, generation_jobs, references, health
 
 api_router = APIRouter()
 
@@ -7,4 +7,6 @@ api_router = APIRouter()
 api_router.include_router(user.router, prefix="/users")
 api_router.include_router(report.router, prefix="/reports")
 api_router.include_router(sections.router)  # Prefix already set in router
+api_router.include_router(generation_jobs.router, prefix="/generation-jobs")
 api_router.include_router(references.router, prefix="/references")
+api_router.include_router(health.router, prefix="/health")
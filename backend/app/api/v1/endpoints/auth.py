@@ -2,7 +2,7 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.api import deps
@@ -15,13 +15,12 @@ router = APIRouter()
 security_basic = HTTPBasic()
 
 # Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     credentials: HTTPBasicCredentials = Depends(security_basic),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ) -> Any:
     """
     Get access token for user using email/password
@@ -29,7 +28,7 @@ def login(
     try:
         logger.debug(f"Login attempt for user: {credentials.username}")
         auth_service = AuthService(db)
-        user = auth_service.authenticate(
+        user = await auth_service.authenticate(
             email=credentials.username,
             password=credentials.password
         )
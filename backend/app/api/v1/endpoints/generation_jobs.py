@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.models.generation_job import GenerationJob
+from app.schemas.generation_job import GenerationJobResponse
+
+router = APIRouter(
+    tags=["content-management"],
+    responses={404: {"description": "Generation job not found"}}
+)
+
+@router.get("/{job_id}",
+    response_model=GenerationJobResponse,
+    summary="Get generation job",
+    description=(
+        "Status of a job queued by POST /sections/{section_id}/generate. Once it has succeeded, "
+        "result holds the generated content and section_version the section version it was saved as."
+    ),
+    dependencies=[deps.query_budget(2)]
+)
+async def get_generation_job(
+    job: GenerationJob = Depends(deps.get_owned_generation_job)
+):
+    """Get a generation job"""
+    return job
@@ -0,0 +1,18 @@
+from typing import List
+from fastapi import APIRouter
+
+from app.db.pool_metrics import registry
+from app.schemas.health import PoolMetricsResponse
+
+router = APIRouter(
+    tags=["health"]
+)
+
+@router.get("/db-pool",
+    response_model=List[PoolMetricsResponse],
+    summary="Database pool metrics",
+    description="Connection pool usage for every engine in the worker that answers the request"
+)
+async def get_pool_metrics():
+    """Get connection pool metrics"""
+    return [metrics.snapshot() for metrics in registry.values()]
@@ -3,7 +3,9 @@ from uuid import UUID
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from starlette import status
 
 from app import schemas
@@ -22,39 +24,36 @@ router = APIRouter(
 @router.get("/{reference_id}", 
     response_model=ReferenceResponse,
     summary="Get reference",
-    description="Get a specific reference by ID"
+    description="Get a specific reference by ID",
+    dependencies=[deps.query_budget(2)]
 )
 async def get_reference(
-    reference_id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    reference: Reference = Depends(deps.get_owned_reference_for_read)
 ):
     """Get a specific reference"""
-    reference = db.query(Reference).filter(Reference.id == reference_id).first()
-    if not reference:
-        raise HTTPException(status_code=404, detail="Reference not found")
-    
-    # Verify user has access to this reference's report
-    if reference.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this reference")
-    
     return reference
 
 @router.get("/report/{report_id}", 
     response_model=List[ReferenceResponse],
     summary="Get report references",
-    description="Get all references for a specific report"
+    description="Get all references for a specific report",
+    dependencies=[deps.query_budget(3)]
 )
 async def get_report_references(
     report_id: UUID,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     """Get all references for a report"""
-    report = db.query(Report).filter(
-        Report.id == report_id,
-        Report.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Report)
+        .options(selectinload(Report.references))
+        .where(
+            Report.id == report_id,
+            Report.user_id == current_user.id
+        )
+    )
+    report = result.unique().scalar_one_or_none()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     
@@ -63,18 +62,22 @@ async def get_report_references(
 @router.post("/generate/{report_id}",
     response_model=ReferencePageResponse,
     summary="Generate references page",
-    description="Generate the references page for a report based on citations"
+    description="Generate the references page for a report based on citations",
+    dependencies=[deps.query_budget(3)]
 )
 async def generate_references_page_endpoint(
     report_id: UUID,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """Generate references page for a report"""
-    report = db.query(Report).filter(
-        Report.id == report_id,
-        Report.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Report).where(
+            Report.id == report_id,
+            Report.user_id == current_user.id
+        )
+    )
+    report = result.unique().scalar_one_or_none()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     
@@ -83,8 +86,7 @@ async def generate_references_page_endpoint(
     
     # Update report's references
     report.references_content = references_content
-    db.commit()
-    db.refresh(report)
+    await db.commit()
     
     return {
         "report_id": report.id,
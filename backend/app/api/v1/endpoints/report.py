@@ -1,16 +1,18 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 import logging
 
 from app.api import deps
 from app.models.user import User
-from app.models.report import Report
-from app.models.chapter import Chapter
-from app.schemas.report import ReportCreate, ReportResponse
-from app.schemas.chapter import ChapterResponse
-from app.services.report import ReportService
+from app.models.report import Report, ReportStatus
+from app.schemas.report import ReportCreate, ReportResponse, ReportPage, ReportOutline, ReportInclude, ReportExclude
+from app.schemas.chapter import ChapterResponse, ChapterOutline
+from app.services.report import ReportService, report_tree_options
+from app.core.etag import if_none_match, make_etag, not_modified, set_etag
+from app.core.report_cache import report_cache
+from app.core.serialization import orjson_response
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -25,12 +27,13 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED, 
     summary="Create new report",
     description="Create a new report with predefined chapters",
-    tags=["report-management"]
+    tags=["report-management"],
+    dependencies=[deps.query_budget(8)]
 )
 async def create_report(
     report_in: ReportCreate,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """Create a new report with predefined chapters"""
     try:
@@ -38,10 +41,10 @@ async def create_report(
         logger.debug(f"Report data: {report_in.dict()}")
         
         report_service = ReportService(db)
-        report = report_service.create_report(report_in, current_user.id)
+        report = await report_service.create_report(report_in, current_user.id, current_user.institution)
         
         logger.info(f"Successfully created report {report.id}")
-        return report
+        return orjson_response(ReportResponse, report, status_code=status.HTTP_201_CREATED)
         
     except Exception as e:
         logger.error(f"Error creating report: {str(e)}", exc_info=True)
@@ -54,19 +57,20 @@ async def create_report(
     response_model=List[ReportResponse], 
     summary="List all reports",
     description="Get all reports for the current user",
-    tags=["report-management"]
+    tags=["report-management"],
+    dependencies=[deps.query_budget(5), Depends(deps.flush_autosaves)]
 )
 async def list_reports(
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     """List all reports for the current user"""
     try:
         logger.info(f"Listing reports for user {current_user.id}")
         report_service = ReportService(db)
-        reports = report_service.list_user_reports(current_user.id)
+        reports = await report_service.list_user_reports(current_user.id)
         logger.info(f"Found {len(reports)} reports")
-        return reports
+        return orjson_response(List[ReportResponse], reports)
     except Exception as e:
         logger.error(f"Error listing reports: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -74,24 +78,97 @@ async def list_reports(
             detail=f"Error listing reports: {str(e)}"
         )
 
+@router.get("/summaries",
+    response_model=ReportPage,
+    summary="List report summaries",
+    description="Get one page of lightweight report summaries (no content), newest first",
+    tags=["report-management"],
+    dependencies=[deps.query_budget(2), Depends(deps.flush_autosaves)]
+)
+async def list_report_summaries(
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    status_filter: Optional[ReportStatus] = Query(None, alias="status", description="Only reports with this status"),
+    department: Optional[str] = Query(None, description="Only reports from this department"),
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    """List one page of report summaries for the current user"""
+    try:
+        logger.info(f"Listing report summaries for user {current_user.id}")
+        report_service = ReportService(db)
+        items, next_cursor = await report_service.list_user_report_summaries(
+            current_user.id,
+            limit=limit,
+            cursor=cursor,
+            status_filter=status_filter,
+            department=department
+        )
+        logger.info(f"Found {len(items)} report summaries")
+        return {"items": items, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error listing report summaries: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error listing report summaries: {str(e)}"
+        )
+
 @router.get("/{report_id}", 
-    response_model=ReportResponse, 
+    response_model=None,
+    responses={200: {"model": ReportResponse, "description": "Report outline and references, plus the parts listed in include"}},
     summary="Get report with chapters",
-    description="Get a specific report with all its chapters",
-    tags=["report-management"]
+    description=(
+        "Get a specific report with all its chapters and references. By default sections are "
+        "returned without their content; use include=content to get it, and exclude=references "
+        "to leave the references out. Responses carry an ETag; send it back in If-None-Match to get a 304 when "
+        "nothing in the report changed."
+    ),
+    tags=["report-management"],
+    dependencies=[deps.query_budget(6), Depends(deps.flush_autosaves)]
 )
 async def get_report(
+    request: Request,
     report_id: UUID,
+    include: List[ReportInclude] = Query([], description="Optional parts to return: content"),
+    exclude: List[ReportExclude] = Query([], description="Default parts to leave out: references"),
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     """Get a specific report with all its chapters"""
     try:
         logger.info(f"Getting report {report_id} for user {current_user.id}")
+        include_content = ReportInclude.CONTENT in include
+        include_references = ReportExclude.REFERENCES not in exclude
         report_service = ReportService(db)
-        report = report_service.get_report(report_id, current_user.id)
+
+        # Answer polling clients from a one-query fingerprint before loading the tree
+        fingerprint = await report_service.get_report_fingerprint(report_id, current_user.id)
+        etag = make_etag("report", fingerprint, include_content, include_references)
+        if if_none_match(request, etag):
+            return not_modified(etag)
+
+        # The ETag is the tree version plus the variant, so a hit is always current
+        body = report_cache.get("report", report_id, etag)
+        if body is not None:
+            return set_etag(Response(body, media_type="application/json"), etag)
+
+        report = await report_service.get_report(
+            report_id,
+            current_user.id,
+            options=report_tree_options(include_content, include_references)
+        )
         logger.info(f"Successfully retrieved report {report_id}")
-        return report
+        response = orjson_response(
+            ReportResponse if include_content else ReportOutline,
+            report,
+            exclude=None if include_references else {"references"}
+        )
+        report_cache.set("report", report_id, etag, response.body, [chapter.id for chapter in report.chapters])
+        return set_etag(response, etag)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting report: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -100,37 +177,49 @@ async def get_report(
         )
 
 @router.get("/{report_id}/chapters/{chapter_id}", 
-    response_model=ChapterResponse,
+    response_model=None,
+    responses={200: {"model": ChapterResponse, "description": "Chapter outline, plus section content with include=content"}},
     summary="Get chapter with sections",
-    description="Get a specific chapter with all its sections",
-    tags=["report-management"]
+    description=(
+        "Get a specific chapter with all its sections. Sections are returned without their "
+        "content unless include=content is given. Supports If-None-Match like the report read."
+    ),
+    tags=["report-management"],
+    dependencies=[deps.query_budget(4), Depends(deps.flush_autosaves)]
 )
 async def get_chapter(
+    request: Request,
     report_id: UUID,
     chapter_id: UUID,
+    include: List[ReportInclude] = Query([], description="Optional parts to return: content"),
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_read_db)
 ):
     """Get a specific chapter with all its sections"""
     try:
         logger.info(f"Getting chapter {chapter_id} for report {report_id} and user {current_user.id}")
+        include_content = ReportInclude.CONTENT in include
         report_service = ReportService(db)
-        report = report_service.get_report(report_id, current_user.id)
-        
-        # Find the specific chapter
-        chapter = db.query(Chapter).filter(
-            Chapter.id == chapter_id,
-            Chapter.report_id == report_id
-        ).first()
-        
-        if not chapter:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Chapter not found"
-            )
+
+        fingerprint = await report_service.get_chapter_fingerprint(report_id, chapter_id, current_user.id)
+        etag = make_etag("chapter", fingerprint, include_content)
+        if if_none_match(request, etag):
+            return not_modified(etag)
+
+        body = report_cache.get("chapter", report_id, etag)
+        if body is not None:
+            return set_etag(Response(body, media_type="application/json"), etag)
+
+        chapter = await report_service.get_chapter(
+            report_id, chapter_id, current_user.id, include_content=include_content
+        )
         
         logger.info(f"Successfully retrieved chapter {chapter_id}")
-        return chapter
+        response = orjson_response(ChapterResponse if include_content else ChapterOutline, chapter)
+        report_cache.set("chapter", report_id, etag, response.body, [chapter.id])
+        return set_etag(response, etag)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting chapter: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -142,18 +231,19 @@ async def get_chapter(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete report",
     description="Delete a report and all its chapters and sections",
-    tags=["report-management"]
+    tags=["report-management"],
+    dependencies=[deps.query_budget(8)]
 )
 async def delete_report(
     report_id: UUID,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """Delete a report and all its associated data"""
     try:
         logger.info(f"Deleting report {report_id} for user {current_user.id}")
         report_service = ReportService(db)
-        report_service.delete_report(report_id, current_user.id)
+        await report_service.delete_report(report_id, current_user.id)
         logger.info(f"Successfully deleted report {report_id}")
     except Exception as e:
         logger.error(f"Error deleting report: {str(e)}", exc_info=True)
@@ -1,41 +1,86 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 import json
 from uuid import UUID
 
 from app.api import deps
+from app.models.enums import RevisionReason
 from app.models.section import Section
 from app.models.user import User
-from app.schemas.section import SectionContent, SectionResponse
+from app.schemas.section import (
+    SectionContent, SectionContentPatch, SectionResponse,
+    SectionRevisionResponse, SectionRevisionSummary, AutosaveStatus,
+    SectionBatchRequest, SectionBatchResponse
+)
 from app.schemas.file_upload import FileUploadResponse
-from app.core.content_generation import generate_section_content
+from app.schemas.generation_job import GenerationJobResponse
+from app.core.config import settings
+from app.core.content_generation import get_provider
+from app.core.etag import if_none_match, make_etag, not_modified, set_etag
+from app.core.serialization import orjson_response
+from app.services.autosave import AutosaveConflict, autosave_buffer
+from app.services.generation_jobs import EnqueueConflict, enqueue_generation, get_active_job, list_section_jobs
+from app.services.generation_stream import STREAM_HEADERS, stream_section_generation
+from app.services.section_batch import apply_section_batch
+from app.services.section_revisions import get_revision, list_revisions, record_revision
+from app.services.text_patch import InvalidEdit, apply_edits
 
 router = APIRouter(
     prefix="/sections",
     tags=["content-management"]
 )
 
+async def _commit_section(db: AsyncSession, section: Section, reason: RevisionReason) -> Section:
+    """
+    Save the section's new content as a revision and commit; 409 if another
+    request updated the section since it was read.
+    """
+    await record_revision(db, section, reason)
+    try:
+        await db.commit()
+    except (StaleDataError, IntegrityError):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Section was modified by another request; reload it and retry"
+        )
+    await db.refresh(section)
+    return section
+
+@router.post("/batch",
+    response_model=SectionBatchResponse,
+    summary="Update sections in batch",
+    description=(
+        "Apply content updates and resets to up to 200 sections in one transaction. Each item "
+        "may carry a base_version. Results are returned per item in request order: updated, "
+        "unchanged, not_found, forbidden, conflict or invalid."
+    ),
+    dependencies=[deps.query_budget(5), Depends(deps.flush_autosaves)]
+)
+async def batch_update_sections(
+    batch: SectionBatchRequest,
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """Update many sections at once"""
+    return {"results": await apply_section_batch(db, current_user.id, batch.items)}
+
 @router.post("/{section_id}/content", 
     response_model=SectionResponse,
     summary="Add content to section",
-    description="Add content to a section. This content will be used as context for AI generation."
+    description="Add content to a section. This content will be used as context for AI generation.",
+    dependencies=[deps.query_budget(6), Depends(deps.flush_autosaves)]
 )
 async def add_section_content(
-    section_id: UUID,
     content: SectionContent,
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    section: Section = Depends(deps.get_owned_section),
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """Add content to a section"""
-    section = db.query(Section).filter(Section.id == section_id).first()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    # Verify user has access to this section's report
-    if section.chapter.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to modify this section")
-    
     # Store user content
     section.user_content = content.content
     section.final_content = content.content  # Also set as final content until AI generates
@@ -43,50 +88,128 @@ async def add_section_content(
     # Update word count
     section.word_count = len(content.content.split())
     
-    db.commit()
-    db.refresh(section)
-    return section
+    return await _commit_section(db, section, RevisionReason.EDIT)
+
+@router.patch("/{section_id}/content",
+    response_model=SectionResponse,
+    summary="Edit section content",
+    description=(
+        "Apply text edits to the section's user content instead of sending the whole text. "
+        "Each edit replaces the characters [start, end) of the text at base_version (offsets are "
+        "Unicode code points) and edits must be sorted and non-overlapping. Returns 409 if the "
+        "section is no longer at base_version."
+    ),
+    responses={409: {"description": "base_version is stale"}, 422: {"description": "Edits do not fit the text"}},
+    dependencies=[deps.query_budget(6), Depends(deps.flush_autosaves)]
+)
+async def patch_section_content(
+    patch: SectionContentPatch,
+    section: Section = Depends(deps.get_owned_section),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """Apply incremental edits to a section's content"""
+    if patch.base_version != section.version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Section is at version {section.version}, edits were made against version {patch.base_version}"
+        )
+
+    # The stored count describes user_content only while nothing else replaced final_content
+    base = section.user_content or ""
+    word_count = section.word_count if section.final_content == section.user_content else None
+    try:
+        content, word_count = apply_edits(base, patch.edits, word_count)
+    except InvalidEdit as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    section.user_content = content
+    section.final_content = content
+    section.word_count = word_count
+    return await _commit_section(db, section, RevisionReason.EDIT)
+
+def _autosave_status(section: Section) -> dict:
+    pending = autosave_buffer.pending(section.id)
+    return {
+        "section_id": section.id,
+        "pending": pending is not None,
+        "pending_since": pending.pending_since if pending else None,
+        "saved_version": section.version,
+        "saved_at": section.updated_at
+    }
+
+@router.put("/{section_id}/autosave",
+    response_model=AutosaveStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Autosave section content",
+    description=(
+        "Buffer the section's latest content for a coalesced write. Saves arriving within "
+        "the autosave window become one database write. Buffered content is also written "
+        "before any read or other write by the same user. Returns 202 while the save is "
+        "only buffered, or 200 when it was written through immediately. A write-through that "
+        "races another write of the section returns 409 and is not saved."
+    ),
+    responses={409: {"description": "Section was modified by another request"}},
+    dependencies=[deps.query_budget(3)]
+)
+async def autosave_section_content(
+    content: SectionContent,
+    response: Response,
+    current_user: User = Depends(deps.get_current_user),
+    section: Section = Depends(deps.get_owned_section),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """Buffer an autosave of a section's content"""
+    try:
+        buffered = await autosave_buffer.save(section.id, current_user.id, content.content)
+    except AutosaveConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Section was modified by another request; reload it and retry"
+        )
+    if not buffered:
+        response.status_code = status.HTTP_200_OK
+        await db.refresh(section)
+    return _autosave_status(section)
+
+@router.get("/{section_id}/autosave",
+    response_model=AutosaveStatus,
+    summary="Get autosave status",
+    description="Whether an autosave is buffered for the section, and the durably saved version",
+    dependencies=[deps.query_budget(2)]
+)
+async def get_autosave_status(
+    section: Section = Depends(deps.get_owned_section_for_read)
+):
+    """Get a section's autosave status"""
+    return _autosave_status(section)
 
 @router.get("/{section_id}/content",
     response_model=SectionResponse,
     summary="Get section content",
-    description="Get the content of a section"
+    description="Get the content of a section. Supports If-None-Match with the returned ETag.",
+    dependencies=[deps.query_budget(2), Depends(deps.flush_autosaves)]
 )
 async def get_section_content(
-    section_id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    section: Section = Depends(deps.get_owned_section_for_read)
 ):
     """Get section content"""
-    section = db.query(Section).filter(Section.id == section_id).first()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    # Verify user has access to this section's report
-    if section.chapter.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to view this section")
-    
-    return section
+    etag = make_etag("section", section.id, section.version)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    return set_etag(orjson_response(SectionResponse, section), etag)
 
 @router.post("/{section_id}/reset",
     response_model=SectionResponse,
     summary="Reset section content",
-    description="Reset a section's content while maintaining its structure. This will clear user content, AI content, and final content."
+    description="Reset a section's content while maintaining its structure. This will clear user content, AI content, and final content.",
+    dependencies=[deps.query_budget(6), Depends(deps.flush_autosaves)]
 )
 async def reset_section(
-    section_id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    section: Section = Depends(deps.get_owned_section),
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """Reset a section's content"""
-    section = db.query(Section).filter(Section.id == section_id).first()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    # Verify user has access to this section's report
-    if section.chapter.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to modify this section")
-    
     # Reset all content fields
     section.user_content = None
     section.ai_content = None
@@ -96,63 +219,103 @@ async def reset_section(
     # Reset any associated metadata
     section.citations = None
     
-    db.commit()
-    db.refresh(section)
-    return section
+    return await _commit_section(db, section, RevisionReason.RESET)
 
 @router.post("/{section_id}/generate",
-    response_model=SectionResponse,
+    response_model=GenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Generate content",
-    description="Generate content for the section using AI"
+    description=(
+        "Queue AI generation for the section and return the job; the Location header points at "
+        "GET /generation-jobs/{job_id}. When the job succeeds the content is saved as the section's "
+        "ai_content and final_content. If the section already has a queued or running job, that job "
+        "is returned instead of queueing another."
+    ),
+    responses={409: {"description": "Another request is queueing the section"}, 422: {"description": "Unknown provider"}},
+    dependencies=[deps.query_budget(4), Depends(deps.flush_autosaves)]
 )
 async def generate_content(
-    section_id: UUID,
+    response: Response,
+    provider: Optional[str] = Query(None, description="Generation provider; defaults to the configured one"),
+    section: Section = Depends(deps.get_owned_section),
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
-    """Generate content for a section using AI"""
-    section = db.query(Section).filter(Section.id == section_id).first()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    # Verify user has access to this section's report
-    if section.chapter.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to modify this section")
-    
-    # Generate content using AI
-    generated_content = await generate_section_content(section)
-    section.ai_content = generated_content
-    section.final_content = generated_content  # Set as final content
-    
-    # Update word count
-    section.word_count = len(generated_content.split())
-    
-    db.commit()
-    db.refresh(section)
-    return section
+    """Queue AI generation for a section"""
+    try:
+        job = await enqueue_generation(db, section.id, current_user.id, provider)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.args[0])
+    except EnqueueConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    response.headers["Location"] = f"{settings.API_V1_STR}/generation-jobs/{job.id}"
+    return job
+
+@router.post("/{section_id}/generate/stream",
+    response_class=StreamingResponse,
+    summary="Generate content as a stream",
+    description=(
+        "Generate content for the section and send it as Server-Sent Events while it is produced: "
+        "start, then one chunk event per piece of text, then done with the new section version "
+        "and word count (or error). Partial output is saved to ai_content as it arrives, also "
+        "when the client disconnects; final_content and word_count are set when the stream ends."
+    ),
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Event stream"},
+        409: {"description": "The section has a queued or running generation job"},
+        422: {"description": "Unknown provider"}
+    },
+    dependencies=[deps.query_budget(4), Depends(deps.flush_autosaves)]
+)
+async def stream_generated_content(
+    provider: Optional[str] = Query(None, description="Generation provider; defaults to the configured one"),
+    section: Section = Depends(deps.get_owned_section_with_report),
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """Stream AI generation for a section"""
+    try:
+        generation_provider = get_provider(provider)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.args[0])
+    if await get_active_job(db, section.id) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Section has a queued or running generation job"
+        )
+    return StreamingResponse(
+        stream_section_generation(section, current_user.id, generation_provider),
+        media_type="text/event-stream",
+        headers=STREAM_HEADERS
+    )
+
+@router.get("/{section_id}/generation-jobs",
+    response_model=List[GenerationJobResponse],
+    summary="List generation jobs",
+    description="Generation jobs of the section, newest first",
+    dependencies=[deps.query_budget(3)]
+)
+async def list_generation_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    section: Section = Depends(deps.get_owned_section),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """List a section's generation jobs"""
+    return await list_section_jobs(db, section.id, limit)
 
 @router.post("/{section_id}/files",
     response_model=FileUploadResponse,
     summary="Upload file",
-    description="Upload a file (image/diagram) to a section"
+    description="Upload a file (image/diagram) to a section",
+    dependencies=[deps.query_budget(2)]
 )
 async def upload_file(
-    section_id: UUID,
+    section: Section = Depends(deps.get_owned_section),
     file: UploadFile = File(...),
     position_data: str = Form(...),
-    caption: str = Form(None),
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    caption: str = Form(None)
 ):
     """Upload a file to a section"""
-    section = db.query(Section).filter(Section.id == section_id).first()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    # Verify user has access to this section's report
-    if section.chapter.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to modify this section")
-    
     # Process file upload
     try:
         position = json.loads(position_data)
@@ -172,22 +335,71 @@ async def upload_file(
 @router.get("/{section_id}/files",
     response_model=List[FileUploadResponse],
     summary="Get section files",
-    description="Get all files uploaded to a section"
+    description="Get all files uploaded to a section",
+    dependencies=[deps.query_budget(2)]
 )
 async def get_section_files(
-    section_id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    section: Section = Depends(deps.get_owned_section_for_read)
 ):
     """Get all files uploaded to a section"""
-    section = db.query(Section).filter(Section.id == section_id).first()
-    if not section:
-        raise HTTPException(status_code=404, detail="Section not found")
-    
-    # Verify user has access to this section's report
-    if section.chapter.report.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to view this section")
-    
     # TODO: Implement file retrieval logic
     # For now, just return an empty list
     return []
+
+@router.get("/{section_id}/revisions",
+    response_model=List[SectionRevisionSummary],
+    summary="List section revisions",
+    description="List saved revisions of a section's content, newest first. Use `before` to page back.",
+    dependencies=[deps.query_budget(3), Depends(deps.flush_autosaves)]
+)
+async def get_section_revisions(
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    before: Optional[int] = Query(None, description="Only revisions older than this revision number"),
+    section: Section = Depends(deps.get_owned_section_for_read),
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    """List a section's revisions"""
+    return await list_revisions(db, section.id, limit=limit, before=before)
+
+@router.get("/{section_id}/revisions/{revision_number}",
+    response_model=SectionRevisionResponse,
+    summary="Get section revision",
+    description="Get one revision of a section with its content",
+    dependencies=[deps.query_budget(3), Depends(deps.flush_autosaves)]
+)
+async def get_section_revision(
+    revision_number: int,
+    section: Section = Depends(deps.get_owned_section_for_read),
+    db: AsyncSession = Depends(deps.get_read_db)
+):
+    """Get a section revision"""
+    revision, state = await get_revision(db, section.id, revision_number)
+    return {
+        "section_id": section.id,
+        "revision_number": revision.revision_number,
+        "reason": revision.reason,
+        "source_type": revision.source_type,
+        "word_count": revision.word_count,
+        "created_at": revision.created_at,
+        **state
+    }
+
+@router.post("/{section_id}/revisions/{revision_number}/restore",
+    response_model=SectionResponse,
+    summary="Restore section revision",
+    description="Restore a section's content to an earlier revision. The restore is itself saved as a new revision.",
+    dependencies=[deps.query_budget(7), Depends(deps.flush_autosaves)]
+)
+async def restore_section_revision(
+    revision_number: int,
+    section: Section = Depends(deps.get_owned_section),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """Restore a section revision"""
+    revision, state = await get_revision(db, section.id, revision_number)
+    for field, value in state.items():
+        setattr(section, field, value)
+    section.word_count = revision.word_count
+    if revision.source_type is not None:
+        section.source_type = revision.source_type
+    return await _commit_section(db, section, RevisionReason.RESTORE)
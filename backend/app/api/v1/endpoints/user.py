@@ -2,12 +2,13 @@ from typing import Any, List
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from pydantic.networks import EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.models.user import User
 from app.schemas import user as schemas
+from app.services.auth import AuthService
 from datetime import datetime
 from jose import jwt
 from app.core.config import settings
@@ -23,7 +24,7 @@ router = APIRouter(tags=["users"])
 )
 async def create_user(
     user_in: schemas.UserCreate,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Create new user with the following fields:
@@ -33,14 +34,16 @@ async def create_user(
     - **level**: required (e.g., HND, BSc)
     - **institution**: required
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    # Hash before touching the database so no pooled connection is held during bcrypt
+    hashed_password = await get_password_hash_async(user_in.password)
+
+    user = await AuthService(db).get_user_by_email(user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user_in.password)
     user = User(
         email=user_in.email,
         password=hashed_password,
@@ -50,8 +53,8 @@ async def create_user(
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
@@ -63,7 +66,7 @@ async def create_user(
 )
 async def login(
     user_in: schemas.UserLogin,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Login with the following fields:
@@ -74,8 +77,10 @@ async def login(
     - **access_token**: JWT token for Bearer authentication
     - **token_type**: bearer
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if not user or not verify_password(user_in.password, user.password):
+    user = await AuthService(db).get_user_by_email(user_in.email)
+    # End the read transaction so no pooled connection is held during bcrypt
+    await db.commit()
+    if not user or not await verify_password_async(user_in.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -83,7 +88,7 @@ async def login(
     
     # Update last login time
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
     # Create minimal token with just the user ID
     access_token = jwt.encode(
@@ -131,7 +136,7 @@ async def logout(current_user: User = Depends(deps.get_current_user)):
 async def update_user(
     user_in: schemas.UserUpdate,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Update current user profile with optional fields.
@@ -143,14 +148,16 @@ async def update_user(
     - **institution**: optional
     - **password**: optional, min length 8
     """
+    # current_user comes detached from the principal cache; attach a copy to this session
+    user = await db.merge(current_user, load=False)
     for field, value in user_in.dict(exclude_unset=True).items():
         if field == "password":
-            value = get_password_hash(value)
-        setattr(current_user, field, value)
+            value = await get_password_hash_async(value)
+        setattr(user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    await db.commit()  # Drops the cached principal (see app.core.principal_cache)
+    await db.refresh(user)
+    return user
 
 @router.delete(
     "/me",
@@ -160,12 +167,13 @@ async def update_user(
 )
 async def delete_user(
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Delete current authenticated user's account.
     Requires Bearer token authentication.
     """
-    db.delete(current_user)
-    db.commit()
+    user = await db.merge(current_user, load=False)
+    await db.delete(user)
+    await db.commit()  # Drops the cached principal (see app.core.principal_cache)
     return None
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Negotiated response compression.
+
+CompressionMiddleware compresses complete (non-streaming) response bodies
+with the best encoding the client accepts: zstd, then br, then gzip. zstd and
+brotli are used only when the optional `zstandard` / `brotli` packages
+are installed. Bodies smaller than COMPRESSION_MIN_SIZE are sent as is.
+Compression is also skipped for responses that already have a
+Content-Encoding, for media types that are already compressed (images,
+archives, PDFs...), for 204/304 responses and for streaming bodies.
+Bodies of COMPRESSION_THREAD_THRESHOLD bytes or more are compressed on a
+worker thread so the event loop keeps serving other requests.
+
+Strong ETags are given an encoding suffix ("abc" -> "abc-gzip"), since the
+compressed bytes are a different representation; app.core.etag strips
+the suffix again when it compares If-None-Match.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+import gzip
+
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Media types that gain nothing from another compression pass
+_INCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+_INCOMPRESSIBLE_TYPES = {
+    "application/zip", "application/gzip", "application/x-gzip", "application/zstd",
+    "application/x-bzip2", "application/x-7z-compressed", "application/x-rar-compressed",
+    "application/pdf", "application/octet-stream",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+
+def _zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL).compress(body)
+
+def available_encodings() -> Dict[str, Callable[[bytes], bytes]]:
+    """Supported encodings in server preference order"""
+    encodings = {}
+    if zstandard is not None:
+        encodings["zstd"] = _zstd
+    if brotli is not None:
+        encodings["br"] = _brotli
+    encodings["gzip"] = _gzip
+    return encodings
+
+ENCODINGS = available_encodings()
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick an encoding from an Accept-Encoding header.
+    The client's q-values win; ties go to the server preference order.
+    """
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+
+    best: Optional[Tuple[float, str]] = None
+    for encoding in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, encoding)
+    return best[1] if best else None
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in _INCOMPRESSIBLE_TYPES or content_type.startswith(_INCOMPRESSIBLE_PREFIXES):
+        return False
+    return True
+
+def _suffix_etag(headers: MutableHeaders, encoding: str, only_if_in: Optional[str] = None) -> bool:
+    """Mark a strong ETag as belonging to the `encoding` representation; True if it was"""
+    etag = headers.get("etag")
+    if not etag or not (etag.startswith('"') and etag.endswith('"')):
+        return False
+    suffixed = f'{etag[:-1]}-{encoding}"'
+    if only_if_in is None or suffixed in only_if_in:
+        headers["ETag"] = suffixed
+        return True
+    return False
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; see the module docstring"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            status = start_message["status"]
+
+            # Keep the validator the client holds for the encoded representation,
+            # and mark it as one that depends on Accept-Encoding
+            if status == 304 and _suffix_etag(headers, encoding, request_headers.get("if-none-match", "")):
+                headers.add_vary_header("Accept-Encoding")
+
+            # Streaming bodies and responses that must not or need not be compressed
+            if (
+                message.get("more_body", False)
+                or status < 200 or status in (204, 304)
+                or not _is_compressible(headers)
+                or len(body) < settings.COMPRESSION_MIN_SIZE
+            ):
+                if status not in (204, 304) and _is_compressible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compress = ENCODINGS[encoding]
+            if len(body) >= settings.COMPRESSION_THREAD_THRESHOLD:
+                compressed = await to_thread.run_sync(compress, body)
+            else:
+                compressed = compress(body)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            _suffix_etag(headers, encoding)
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
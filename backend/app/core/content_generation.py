@@ -3,22 +3,75 @@ Core module for AI content generation.
 This will be expanded with actual AI implementation.
 """
 
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+
+from app.core.config import settings
 from app.models.report import Report
 from app.models.section import Section
 
-async def generate_section_content(section: Section) -> str:
+class GenerationProvider(ABC):
     """
-    Generate content for a section using AI.
-    Uses provided context for generation.
-    
-    Args:
-        section: The Section model instance to generate content for
-        
-    Returns:
-        Generated content as string
+    A model backend that writes section content.
+    Providers are registered by name; generation jobs record the name, and
+    the worker pool limits concurrent calls per provider.
+    """
+    name: str
+
+    @abstractmethod
+    async def generate(self, context: Dict[str, Any]) -> str:
+        """Generate section content from build_section_context output"""
+
+    async def stream(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Generate section content as chunks of text, as they are produced.
+        Providers that cannot stream return the whole text as one chunk.
+        """
+        yield await self.generate(context)
+
+class StubProvider(GenerationProvider):
+    """
+    Local provider for development and tests. It streams its text word by
+    word over GENERATION_STUB_DELAY_SECONDS.
+    """
+    name = "stub"
+
+    async def generate(self, context: Dict[str, Any]) -> str:
+        return "".join([chunk async for chunk in self.stream(context)])
+
+    async def stream(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        words = f"Generated content for section {context['section_number']}: {context['section_title']}".split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(settings.GENERATION_STUB_DELAY_SECONDS / len(words))
+            yield word if index == 0 else " " + word
+
+_providers: Dict[str, GenerationProvider] = {}
+
+def register_provider(provider: GenerationProvider) -> None:
+    """Make a provider available to generation jobs under provider.name"""
+    _providers[provider.name] = provider
+
+def get_provider(name: Optional[str] = None) -> GenerationProvider:
+    """The named provider, or GENERATION_PROVIDER; KeyError if it is not registered"""
+    name = name or settings.GENERATION_PROVIDER
+    try:
+        return _providers[name]
+    except KeyError:
+        raise KeyError(f"Unknown generation provider '{name}'") from None
+
+def provider_names() -> List[str]:
+    return list(_providers)
+
+register_provider(StubProvider())
+
+def build_section_context(section: Section) -> Dict[str, Any]:
     """
-    # Build context from section and its relationships
-    context = {
+    Generation context of a section.
+    Needs section.chapter.report loaded; the result is plain data, so it can
+    be built in a short session and used after the session is closed.
+    """
+    return {
         "report_title": section.chapter.report.title,
         "department": section.chapter.report.department,
         "chapter_number": section.chapter.chapter_number,
@@ -26,14 +79,24 @@ async def generate_section_content(section: Section) -> str:
         "section_number": section.section_number,
         "section_title": section.title,
         "user_context": {
-            "typed_content": section.typed_content,
-            "uploaded_content": section.uploaded_content
+            "user_content": section.user_content
         }
     }
+
+async def generate_section_content(section: Section, provider: Optional[str] = None) -> str:
+    """
+    Generate content for a section using AI.
+    Uses provided context for generation.
     
-    # TODO: Implement actual AI generation
-    # This is where we'll integrate the AI agents
-    return f"Generated content for section {section.section_number}: {section.title}"
+    Args:
+        section: The Section model instance to generate content for,
+            with section.chapter.report loaded
+        provider: Registered provider name; defaults to GENERATION_PROVIDER
+        
+    Returns:
+        Generated content as string
+    """
+    return await get_provider(provider).generate(build_section_context(section))
 
 async def generate_references_page(report: Report) -> str:
     """
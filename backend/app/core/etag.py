@@ -0,0 +1,58 @@
+"""
+Strong ETags and conditional GET helpers.
+
+Read endpoints compute an ETag from a cheap fingerprint of the resource
+tree (row counts, section versions and updated_at values) plus the
+representation variant (e.g. which ?include= parts were requested). When the client's
+If-None-Match matches, the endpoint answers 304 without running the heavy
+tree queries or serializing anything.
+"""
+
+from hashlib import blake2b
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Clients may keep the body but must revalidate before every use
+CACHE_CONTROL = "private, no-cache"
+
+# Suffixes app.core.compression appends to the ETag of an encoded body
+_ENCODING_SUFFIXES = ('-gzip"', '-br"', '-zstd"')
+
+def make_etag(*parts: Any) -> str:
+    """Quoted strong ETag derived from the repr of `parts`"""
+    digest = blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def strip_encoding_suffix(etag: str) -> str:
+    """The ETag of the identity representation for a (possibly) compressed one"""
+    for suffix in _ENCODING_SUFFIXES:
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches `etag`"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {
+        strip_encoding_suffix(tag.strip().removeprefix("W/")) for tag in header.split(",")
+    }
+    return etag in candidates
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current validators"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+def set_etag(response: Response, etag: str) -> Response:
+    """Attach the validators to a full response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -1,18 +1,158 @@
+"""
+Application logging.
+
+configure_logging() installs one pipeline for every logger in the process:
+
+    logger -> root QueueHandler (sampling, level checks) -> bounded queue
+           -> QueueListener thread -> StreamHandler(stderr) with JsonFormatter
+
+Request handlers only pay for building the record and a non-blocking queue
+put; formatting and the stderr write happen on the listener thread. When the
+queue is full, records are dropped and counted rather than blocking the
+event loop.
+
+Levels come from Settings: LOG_LEVEL for the root logger and LOG_LEVELS for
+per-logger overrides, e.g. "app.services=DEBUG,sqlalchemy.engine=INFO".
+DEBUG records are sampled with LOG_DEBUG_SAMPLE_RATE so verbose loggers can
+stay on in production.
+"""
+
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import itertools
+import json
 import logging
+import os
+import queue
+import sys
+
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line, including `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class DebugSamplingFilter(logging.Filter):
+    """Keep one in every round(1 / rate) DEBUG records; other levels always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG:
+            return True
+        if self.every == 0:
+            return False
+        return next(self._counter) % self.every == 0
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here, where args and exc_info are
+        # still valid, but keep `extra` fields for the JSON formatter
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+def parse_logger_levels(spec: str) -> Dict[str, str]:
+    """Parse "name=LEVEL,name=LEVEL" into a dict"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def _output_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    if settings.LOG_JSON:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    return handler
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, _output_handler(), respect_handler_level=True)
+    _listener.start()
+
+def configure_logging() -> None:
+    """Route all logging through the queue and start the listener thread (idempotent)"""
+    global _queue_handler
+    if _queue_handler is not None:
+        if _listener is None:
+            _start_listener()
+        return
+
+    _queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(DebugSamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
 
-# Create logger
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+    levels = parse_logger_levels(settings.LOG_LEVELS)
+    if settings.DB_ECHO:
+        levels.setdefault("sqlalchemy.engine", "INFO")
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
 
-# Create console handler and set level to debug
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
+    _start_listener()
 
-# Create formatter
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread, e.g. on shutdown"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None and _queue_handler.dropped:
+        print(f"logging: dropped {_queue_handler.dropped} records (queue full)", file=sys.stderr)
 
-# Add formatter to ch
-ch.setFormatter(formatter)
+def _restart_listener_after_fork() -> None:
+    # Threads do not survive fork, and the parent's queue may have been locked
+    # mid-put; the child gets a fresh queue and its own listener
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        _start_listener()
 
-# Add ch to logger
-logger.addHandler(ch)
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
@@ -0,0 +1,174 @@
+"""
+Prometheus metrics.
+
+The request middleware in app.main records, per route template (e.g.
+/api/v1/reports/{report_id}, never the raw URL) and method:
+
+    http_requests_total{method, route, status}
+    http_request_duration_seconds{method, route}   (histogram)
+    http_requests_in_flight
+
+plus database pool gauges refreshed after every request:
+
+    db_pool_connections{pool, state}   state = checked_out | checked_in | overflow
+    db_pool_size{pool}
+
+and the report read cache (app.core.report_cache):
+
+    report_cache_lookups_total{kind, result}   result = hit | miss
+    report_cache_evictions_total
+    report_cache_bytes, report_cache_entries
+
+and autosave coalescing (app.services.autosave):
+
+    autosave_edits_total      saves accepted by PUT /sections/{id}/autosave
+    autosave_flushes_total    section writes they turned into
+
+and the generation job queue (app.services.generation_jobs):
+
+    generation_jobs_total{provider, outcome}   outcome = succeeded | conflicted | retried | failed
+    generation_duration_seconds{provider}      (histogram of provider calls)
+    generation_running{provider}
+
+GET /metrics serves them in the Prometheus text format. With several
+uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory shared
+by the workers before they start; prometheus_client then keeps the values
+in per-process memory-mapped files and /metrics aggregates all workers,
+whichever one serves the scrape.
+"""
+
+import os
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.routing import Match
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+
+from app.db.pool_metrics import registry as pool_registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Buckets sized for an API whose reads take milliseconds and whose AI calls take seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and method",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum"
+)
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database pool connections by state",
+    ["pool", "state"],
+    multiprocess_mode="livesum"
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured database pool size",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+
+REPORT_CACHE_LOOKUPS = Counter(
+    "report_cache_lookups_total",
+    "Report cache lookups by payload kind and result",
+    ["kind", "result"]
+)
+REPORT_CACHE_EVICTIONS = Counter(
+    "report_cache_evictions_total",
+    "Report cache entries evicted to stay within the size limits"
+)
+REPORT_CACHE_BYTES = Gauge(
+    "report_cache_bytes",
+    "Bytes of serialized payloads held by the report cache",
+    multiprocess_mode="livesum"
+)
+REPORT_CACHE_ENTRIES = Gauge(
+    "report_cache_entries",
+    "Entries held by the report cache",
+    multiprocess_mode="livesum"
+)
+
+AUTOSAVE_EDITS = Counter(
+    "autosave_edits_total",
+    "Autosaves accepted into the write-behind buffer"
+)
+AUTOSAVE_FLUSHES = Counter(
+    "autosave_flushes_total",
+    "Section writes performed by the autosave buffer"
+)
+
+GENERATION_JOBS = Counter(
+    "generation_jobs_total",
+    "Generation job attempts by provider and outcome",
+    ["provider", "outcome"]
+)
+GENERATION_DURATION = Histogram(
+    "generation_duration_seconds",
+    "Duration of generation provider calls",
+    ["provider"],
+    buckets=LATENCY_BUCKETS
+)
+GENERATION_RUNNING = Gauge(
+    "generation_running",
+    "Generation provider calls in progress",
+    ["provider"],
+    multiprocess_mode="livesum"
+)
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, so ids do not explode label cardinality"""
+    route = request.scope.get("route")
+    if route is None:
+        # Only API routes record themselves in the scope; /docs, /openapi.json
+        # and other plain Starlette routes are looked up again
+        for candidate in request.app.router.routes:
+            if candidate.matches(request.scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+def observe_request(method: str, route: str, status_code: int, seconds: float) -> None:
+    REQUESTS.labels(method, route, str(status_code)).inc()
+    REQUEST_LATENCY.labels(method, route).observe(seconds)
+
+def update_pool_gauges() -> None:
+    """Copy the current pool state of this process into the gauges"""
+    for name, metrics in pool_registry.items():
+        snapshot = metrics.snapshot()
+        POOL_SIZE.labels(name).set(snapshot["size"])
+        for state in ("checked_out", "checked_in", "overflow"):
+            POOL_CONNECTIONS.labels(name, state).set(snapshot[state])
+
+def _multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+def metrics_response() -> Response:
+    """Render every metric, aggregated across workers in multiprocess mode"""
+    update_pool_gauges()
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory, e.g. on shutdown"""
+    if _multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,91 @@
+"""
+Authenticated-principal cache.
+
+get_current_user runs on every authenticated request. Instead of selecting
+the user row each time, the loaded User is kept here, detached from any
+session, keyed by the token's `sub` claim. Entries expire after
+PRINCIPAL_CACHE_TTL_SECONDS and the cache holds at most
+PRINCIPAL_CACHE_MAX_ENTRIES users (least recently used are evicted first).
+
+Any ORM update or delete of a User (profile edits, password changes, login
+timestamps, deactivation) drops that user's entry once the transaction
+commits. Dropping it at flush would let a concurrent request cache the row
+as it was before the commit.
+The cache is per worker process, so on other workers a change becomes
+visible when the entry expires; keep the TTL short.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import RoutingSession
+from app.models.user import User
+
+class PrincipalCache:
+    """Bounded TTL/LRU map of token subject -> detached User"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[User]:
+        """Get the cached user for a token subject, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject: str, user: User) -> None:
+        """Cache a user that is no longer attached to a session"""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        """Drop a user's entry, e.g. after the user row changed"""
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_changed_users(session, flush_context):
+    user_ids = session.info.setdefault("changed_user_ids", set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            user_ids.add(str(obj.id))
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        principal_cache.invalidate(user_id)
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
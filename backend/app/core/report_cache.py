@@ -0,0 +1,179 @@
+"""
+Cache of serialized report and chapter reads.
+
+GET /reports/{id} and GET /reports/{id}/chapters/{id} already compute a
+one-query fingerprint of the tree for their ETag. The serialized JSON body is
+cached under (report id, kind, ETag). The ETag covers both the version of the
+tree and the representation variant (?include=...), so a changed tree can
+never be served from an old entry, and a hit skips the tree queries and
+serialization entirely.
+
+Entries are still dropped as soon as a write commits, so memory is not
+spent on dead versions: session events collect the report (and chapter) ids
+touched by every flush and invalidate them after commit. Core statements
+that bypass the unit of work must call `report_cache.invalidate_report`
+themselves.
+
+The cache is reached through the ReportCacheBackend interface.
+MemoryReportCache is a per-process LRU bounded by entry count and total
+bytes; another store (e.g. Redis) can implement the same methods. They are
+synchronous because invalidation runs inside session events.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import RoutingSession
+from app.models.chapter import Chapter
+from app.models.reference import Reference
+from app.models.report import Report
+from app.models.section import Section
+
+class ReportCacheBackend(ABC):
+    """Store of serialized report payloads, keyed by report id, kind and version"""
+
+    @abstractmethod
+    def get(self, kind: str, report_id: Hashable, version: str) -> Optional[bytes]:
+        """The cached body, or None"""
+
+    @abstractmethod
+    def set(
+        self, kind: str, report_id: Hashable, version: str, body: bytes,
+        chapter_ids: Iterable[Hashable] = ()
+    ) -> None:
+        """Cache a body; `chapter_ids` are the chapters it contains, for invalidate_chapter"""
+
+    @abstractmethod
+    def invalidate_report(self, report_id: Hashable) -> None:
+        """Drop every entry of a report"""
+
+    @abstractmethod
+    def invalidate_chapter(self, chapter_id: Hashable) -> None:
+        """Drop every entry of the report a cached chapter belongs to"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop everything"""
+
+class MemoryReportCache(ReportCacheBackend):
+    """Per-process LRU bounded by entry count and total body bytes"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[Hashable, str, str], bytes]" = OrderedDict()
+        self._report_keys: Dict[Hashable, Set[Tuple[Hashable, str, str]]] = {}
+        self._report_chapters: Dict[Hashable, Set[Hashable]] = {}
+        self._chapter_reports: Dict[Hashable, Hashable] = {}
+        self._bytes = 0
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, kind: str, report_id: Hashable, version: str) -> Optional[bytes]:
+        key = (report_id, kind, version)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+        metrics.REPORT_CACHE_LOOKUPS.labels(kind, "miss" if body is None else "hit").inc()
+        return body
+
+    def set(
+        self, kind: str, report_id: Hashable, version: str, body: bytes,
+        chapter_ids: Iterable[Hashable] = ()
+    ) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        key = (report_id, kind, version)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = body
+            self._bytes += len(body)
+            self._report_keys.setdefault(report_id, set()).add(key)
+            chapters = self._report_chapters.setdefault(report_id, set())
+            for chapter_id in chapter_ids:
+                chapters.add(chapter_id)
+                self._chapter_reports[chapter_id] = report_id
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                metrics.REPORT_CACHE_EVICTIONS.inc()
+            self._update_gauges()
+
+    def invalidate_report(self, report_id: Hashable) -> None:
+        with self._lock:
+            for key in list(self._report_keys.get(report_id, ())):
+                self._remove(key)
+            self._update_gauges()
+
+    def invalidate_chapter(self, chapter_id: Hashable) -> None:
+        with self._lock:
+            report_id = self._chapter_reports.get(chapter_id)
+        if report_id is not None:
+            self.invalidate_report(report_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._report_keys.clear()
+            self._report_chapters.clear()
+            self._chapter_reports.clear()
+            self._bytes = 0
+            self._update_gauges()
+
+    def _remove(self, key: Tuple[Hashable, str, str]) -> None:
+        # Caller holds the lock
+        body = self._entries.pop(key, None)
+        if body is None:
+            return
+        self._bytes -= len(body)
+        report_id = key[0]
+        keys = self._report_keys.get(report_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._report_keys[report_id]
+                for chapter_id in self._report_chapters.pop(report_id, ()):
+                    self._chapter_reports.pop(chapter_id, None)
+
+    def _update_gauges(self) -> None:
+        metrics.REPORT_CACHE_BYTES.set(self._bytes)
+        metrics.REPORT_CACHE_ENTRIES.set(len(self._entries))
+
+report_cache: ReportCacheBackend = MemoryReportCache(
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.REPORT_CACHE_MAX_BYTES
+)
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_changed_reports(session, flush_context):
+    report_ids = session.info.setdefault("changed_report_ids", set())
+    chapter_ids = session.info.setdefault("changed_chapter_ids", set())
+    # new/dirty/deleted still describe the flushed changes at this point
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Report):
+            report_ids.add(obj.id)
+        elif isinstance(obj, (Chapter, Reference)):
+            report_ids.add(obj.report_id)
+        elif isinstance(obj, Section):
+            chapter_ids.add(obj.chapter_id)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_changed_reports(session):
+    for report_id in session.info.pop("changed_report_ids", ()):
+        report_cache.invalidate_report(report_id)
+    for chapter_id in session.info.pop("changed_chapter_ids", ()):
+        report_cache.invalidate_chapter(chapter_id)
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_changed_reports(session):
+    session.info.pop("changed_report_ids", None)
+    session.info.pop("changed_chapter_ids", None)
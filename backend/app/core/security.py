@@ -1,19 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, TypeVar, Union
+import asyncio
+import logging
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password"""
+    """Verify a plain password against a hashed password (blocking, ~100 ms of CPU)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
+    """Hash a password (blocking, ~100 ms of CPU)"""
     return pwd_context.hash(password)
 
+# bcrypt releases the GIL while it works, so a small thread pool keeps the
+# event loop free without the cost of a process pool. The pool is created
+# lazily so forked workers each get their own threads.
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_jobs_in_flight = 0
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
+async def _run_password_job(func: Callable[..., T], *args) -> T:
+    """
+    Run a bcrypt call on the password pool.
+    At most PASSWORD_HASH_WORKERS jobs run and PASSWORD_HASH_QUEUE_LIMIT wait;
+    beyond that the request is rejected with 503 so a login burst cannot
+    build an unbounded backlog.
+    """
+    global _password_jobs_in_flight
+    if _password_jobs_in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT:
+        logger.warning(f"Password hashing pool is full ({_password_jobs_in_flight} jobs), rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+        )
+    _password_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_password_executor(), func, *args)
+    finally:
+        _password_jobs_in_flight -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded password pool; use this from async code"""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded password pool; use this from async code"""
+    return await _run_password_job(get_password_hash, password)
+
+def shutdown_password_executor() -> None:
+    """Stop the password pool threads, e.g. on application shutdown"""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
 def create_access_token(
     data: dict[str, Any],
     expires_delta: Union[timedelta, None] = None
@@ -0,0 +1,69 @@
+"""
+Fast JSON responses for large payloads.
+
+FastAPI's default response path validates the returned ORM object against
+`response_model`, converts the result to JSON-compatible Python with
+jsonable_encoder-style serialization and finally runs the stdlib json
+encoder. For full reports (5 chapters, 33 sections, references) that is a
+large share of request CPU.
+
+`orjson_response` converts ORM objects with a TypeAdapter that is compiled
+once per schema. It dumps them to plain Python (UUIDs and datetimes left as
+is) and encodes the result with orjson. Because it returns a Response, FastAPI
+skips its own second validation pass. Keep `response_model` on the route for
+the OpenAPI schema.
+"""
+
+from typing import Any, Dict, List, Optional
+import uuid
+
+import orjson
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+from app.schemas.chapter import ChapterOutline, ChapterResponse
+from app.schemas.reference import ReferenceResponse
+from app.schemas.report import ReportOutline, ReportResponse
+from app.schemas.section import SectionResponse
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+def get_adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter for `schema` (a model or e.g. List[Model]), built once and reused"""
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(schema)
+    return adapter
+
+# Compile the adapters for the report read paths at import time rather than
+# on the first request
+for _schema in (
+    ReportResponse, ReportOutline, List[ReportResponse],
+    ChapterResponse, ChapterOutline, SectionResponse, List[ReferenceResponse],
+):
+    get_adapter(_schema)
+
+def _orjson_default(obj: Any) -> Any:
+    # asyncpg returns its own uuid.UUID subclass, which orjson only accepts as exact uuid.UUID
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def orjson_response(
+    schema: Any,
+    obj: Any,
+    *,
+    status_code: int = status.HTTP_200_OK,
+    exclude: Optional[set] = None
+) -> Response:
+    """
+    Serialize `obj` (ORM rows or plain data) as `schema` and return it as JSON.
+    Rows are read through the schema's attributes exactly once.
+    """
+    adapter = get_adapter(schema)
+    model = adapter.validate_python(obj, from_attributes=True)
+    return Response(
+        orjson.dumps(adapter.dump_python(model, exclude=exclude), default=_orjson_default),
+        status_code=status_code,
+        media_type="application/json"
+    )
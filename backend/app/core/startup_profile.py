@@ -0,0 +1,84 @@
+"""
+Startup profiler.
+Reports how long importing `app.main` takes, broken down per module, and
+fails when the total exceeds the startup budget. New workers spawned by the
+autoscaler pay this cost before they can serve a request.
+
+Usage (from the backend directory):
+    python -m app.core.startup_profile
+    python -m app.core.startup_profile --top 40 --budget-ms 800
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+from app.core.config import settings
+
+@dataclass
+class ModuleImport:
+    """One line of `python -X importtime` output"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def profile_imports(target: str = "app.main") -> List[ModuleImport]:
+    """
+    Import `target` in a fresh interpreter with -X importtime and parse the
+    per-module timings. A subprocess is used so nothing is already cached
+    in sys.modules, which is exactly the situation of a new worker.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{completed.stderr[-2000:]}")
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append(ModuleImport(
+            module=name.strip(),
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(name.lstrip())) // 2
+        ))
+    return imports
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report import time per module for app.main")
+    parser.add_argument("--target", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=settings.STARTUP_IMPORT_BUDGET_MS,
+        help="Fail when the total import time exceeds this many milliseconds"
+    )
+    args = parser.parse_args()
+
+    imports = profile_imports(args.target)
+    total_ms = next(
+        (entry.cumulative_us for entry in imports if entry.module == args.target),
+        sum(entry.self_us for entry in imports)
+    ) / 1000
+
+    print(f"{'self ms':>10} {'cumul ms':>10}  module")
+    for entry in sorted(imports, key=lambda entry: entry.self_us, reverse=True)[:args.top]:
+        print(f"{entry.self_us / 1000:>10.1f} {entry.cumulative_us / 1000:>10.1f}  {entry.module}")
+
+    print(f"\nTotal import time for {args.target}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        print("Startup budget exceeded")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ from app.models.user import User
 from app.models.report import Report
 from app.models.chapter import Chapter
 from app.models.section import Section
+from app.models.section_revision import SectionRevision
+from app.models.generation_job import GenerationJob
 from app.models.file_upload import FileUpload
 
 # This allows Alembic to detect all models when generating migrations
@@ -1,27 +1,31 @@
+import asyncio
 from sqlalchemy import text, inspect
-from app.db.session import engine
+from app.db.session import get_engine, dispose_engine
 
-def check_db():
-    # Get inspector
-    inspector = inspect(engine)
-    
-    # Check sections table
-    print("\n=== SECTIONS TABLE STRUCTURE ===")
-    columns = inspector.get_columns('sections')
-    for col in columns:
-        print(f"Column: {col['name']}, Type: {col['type']}, Nullable: {col['nullable']}")
-    
-    # Check data in sections
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT COUNT(*) from sections"))
+async def check_db():
+    async with get_engine().connect() as conn:
+        # Get inspector
+        columns = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_columns('sections')
+        )
+
+        # Check sections table
+        print("\n=== SECTIONS TABLE STRUCTURE ===")
+        for col in columns:
+            print(f"Column: {col['name']}, Type: {col['type']}, Nullable: {col['nullable']}")
+
+        # Check data in sections
+        result = await conn.execute(text("SELECT COUNT(*) from sections"))
         count = result.scalar()
         print(f"\nTotal sections: {count}")
-        
+
         # Sample some data
         print("\n=== SAMPLE SECTION DATA ===")
-        result = conn.execute(text("SELECT * FROM sections LIMIT 3"))
+        result = await conn.execute(text("SELECT * FROM sections LIMIT 3"))
         for row in result:
             print(row)
 
+    await dispose_engine()
+
 if __name__ == "__main__":
-    check_db()
+    asyncio.run(check_db())
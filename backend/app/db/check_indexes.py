@@ -0,0 +1,68 @@
+"""
+Check that the hot lookup paths are served by indexes.
+
+Runs EXPLAIN for the foreign key lookups used by report, chapter, section
+and reference reads (and by the ownership checks in app.api.deps) and fails
+when the planner cannot use the expected index. Sequential scans are
+disabled for the check so the result does not depend on table size.
+
+    python -m app.db.check_indexes
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from typing import List, Tuple
+from sqlalchemy import text
+from app.db.session import get_engine, dispose_engine
+
+# (index name, query that must use it)
+EXPECTED_INDEXES: List[Tuple[str, str]] = [
+    ("ix_chapters_report_id", "SELECT id FROM chapters WHERE report_id = :id"),
+    ("ix_sections_chapter_id", "SELECT id FROM sections WHERE chapter_id = :id"),
+    ("ix_references_report_id", "SELECT id FROM \"references\" WHERE report_id = :id"),
+    ("ix_file_uploads_section_id", "SELECT id FROM file_uploads WHERE section_id = :id"),
+    # Latest-revision lookups on every content write, via the unique (section_id, revision_number)
+    ("uq_section_revisions_section_id_number",
+     "SELECT id FROM section_revisions WHERE section_id = :id ORDER BY revision_number DESC LIMIT 1"),
+    # Generation workers claiming the next due job
+    ("ix_generation_jobs_status_run_after",
+     "SELECT id FROM generation_jobs WHERE status = 'queued' AND run_after <= now() ORDER BY run_after LIMIT 1"),
+    # Enqueueing returns the section's active job
+    ("uq_generation_jobs_active_section",
+     "SELECT id FROM generation_jobs WHERE section_id = :id AND status IN ('queued', 'running')"),
+    # reports.user_id lookups use the leading column of the pagination index
+    ("ix_reports_user_id_updated_at_id", "SELECT id FROM reports WHERE user_id = :id"),
+]
+
+def _plan_indexes(plan: dict) -> List[str]:
+    """Collect every index name referenced anywhere in a JSON plan"""
+    found = []
+    if "Index Name" in plan:
+        found.append(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_plan_indexes(child))
+    return found
+
+async def check_indexes() -> bool:
+    ok = True
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        print("\n=== INDEX USAGE ===")
+        for index_name, query in EXPECTED_INDEXES:
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), {"id": uuid.uuid4()})
+            raw = result.scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            used = _plan_indexes(plan)
+            if index_name in used:
+                print(f"OK      {index_name}")
+            else:
+                ok = False
+                print(f"MISSING {index_name}: plan uses {used or plan['Node Type']} for: {query}")
+
+    await dispose_engine()
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check_indexes()) else 1)
@@ -0,0 +1,128 @@
+"""
+Per-request SQL instrumentation.
+
+Engine events feed a QueryStats object held in a context variable. The
+request middleware opens one QueryStats per request, so the numbers cover
+everything a request does, including loads triggered while the response is
+serialized. For each request we collect:
+
+- the statement count, checked against the route's `query_budget`
+  (app.api.deps) and reported in the Server-Timing header;
+- total time spent executing statements, also in Server-Timing;
+- statements slower than SLOW_QUERY_MS, logged with their bind shape
+  (parameter names and types, never values);
+- optionally (N_PLUS_ONE_THRESHOLD > 0) how often each statement shape ran,
+  so a statement repeated more than N times in one request is flagged as a
+  likely N+1 pattern.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class QueryStats:
+    """Statements executed within one tracking scope"""
+    count: int = 0
+    db_seconds: float = 0.0
+    slow_count: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated_shapes(self, threshold: int) -> List[tuple]:
+        """(shape, count) for every statement shape that ran more than `threshold` times"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header"""
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries"'
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count and time every statement executed inside the block"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+# asyncpg ($1::VARCHAR) and psycopg2 (%(name)s / %s) placeholders
+_PLACEHOLDER = re.compile(r"\$\d+(?:::[A-Z_]+(?: WITH(?:OUT)? TIME ZONE)?(?:\[\])?)?|%\(\w+\)s|%s")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+def statement_shape(statement: str) -> str:
+    """Normalize placeholders so the same query with a different IN-list length has one shape"""
+    return _PLACEHOLDER_LIST.sub("?...", _PLACEHOLDER.sub("?", statement))
+
+def bind_shape(parameters: Any, executemany: bool) -> Any:
+    """Describe bind parameters by name and type only, so no values reach the logs"""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {bind_shape(parameters[0], False)}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+    # Kept on the per-execution context, so a failed statement leaves nothing behind
+    context._query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_start_time", None)
+    if start_time is None:
+        return
+    elapsed = time.perf_counter() - start_time
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.db_seconds += elapsed
+        if settings.N_PLUS_ONE_THRESHOLD > 0:
+            stats.shapes[statement_shape(statement)] += 1
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        if stats is not None:
+            stats.slow_count += 1
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {statement_shape(statement)}",
+            extra={
+                "duration_ms": round(elapsed * 1000, 2),
+                "bind_shape": bind_shape(parameters, executemany),
+                "executemany": executemany
+            }
+        )
+
+def report_n_plus_one(stats: QueryStats, method: str, path: str) -> None:
+    """Log statement shapes that repeated past N_PLUS_ONE_THRESHOLD within one request"""
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    if threshold <= 0:
+        return
+    for shape, count in stats.repeated_shapes(threshold):
+        logger.warning(
+            f"Possible N+1: {method} {path} ran the same statement {count} times",
+            extra={"statement": shape, "repeat_count": count, "threshold": threshold}
+        )
+
+def install(engine: Engine) -> None:
+    """Attach the statement counter and timer to an engine (use AsyncEngine.sync_engine)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
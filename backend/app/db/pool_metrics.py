@@ -0,0 +1,95 @@
+"""
+Connection pool instrumentation.
+
+Every engine built by app.db.session gets its own PoolMetrics and a
+QueuePool subclass that times how long callers wait for a connection.
+The numbers are per worker process, which is what pool sizing needs:
+each uvicorn worker owns an independent pool.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+@dataclass
+class PoolMetrics:
+    """Counters collected for one engine's pool"""
+    name: str
+    checkouts: int = 0
+    connects: int = 0
+    overflow_hits: int = 0
+    timeouts: int = 0
+    wait_count: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    pool: Pool = field(default=None, repr=False)
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def snapshot(self) -> dict:
+        """Current gauges from the live pool plus the accumulated counters"""
+        pool = self.pool
+        return {
+            "name": self.name,
+            "pid": os.getpid(),
+            "size": pool.size() if pool is not None else 0,
+            "checked_out": pool.checkedout() if pool is not None else 0,
+            "checked_in": pool.checkedin() if pool is not None else 0,
+            "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "overflow_hits": self.overflow_hits,
+            "timeouts": self.timeouts,
+            "wait_count": self.wait_count,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.wait_count, 6) if self.wait_count else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+# Metrics for every engine created in this process, keyed by engine name
+registry: Dict[str, PoolMetrics] = {}
+
+def instrumented_pool_class(metrics: PoolMetrics) -> type:
+    """
+    Build a pool class bound to `metrics`.
+    Binding through the class (rather than the instance) keeps the
+    metrics attached when SQLAlchemy recreates the pool on dispose().
+    """
+
+    class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _do_get(self):
+            start = time.perf_counter()
+            overflow_before = self._overflow
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.timeouts += 1
+                raise
+            finally:
+                metrics.record_wait(time.perf_counter() - start)
+            metrics.checkouts += 1
+            if self._overflow > overflow_before:
+                metrics.connects += 1
+                if self._overflow > 0:
+                    metrics.overflow_hits += 1
+            return connection
+
+    return InstrumentedQueuePool
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    """Get (or create) the metrics object for an engine"""
+    if name not in registry:
+        registry[name] = PoolMetrics(name=name)
+    return registry[name]
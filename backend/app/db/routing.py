@@ -0,0 +1,44 @@
+"""
+Read-your-writes bookkeeping for replica routing.
+
+After a user commits a write, their reads stay on the primary for
+READ_YOUR_WRITES_SECONDS so they never see replica lag on their own edits.
+The window is tracked per worker process; it is a best-effort guard that
+covers the common case of a client reading back through the same worker.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+import time
+from typing import Hashable, Optional
+
+from app.core.config import settings
+
+class WriteTracker:
+    """Bounded map of user id -> time of that user's last committed write"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._last_write: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = Lock()
+
+    def mark(self, user_id: Optional[Hashable]) -> None:
+        """Record that `user_id` just committed a write"""
+        if user_id is None:
+            return
+        with self._lock:
+            self._last_write[user_id] = time.monotonic()
+            self._last_write.move_to_end(user_id)
+            while len(self._last_write) > self.max_entries:
+                self._last_write.popitem(last=False)
+
+    def recently_wrote(self, user_id: Optional[Hashable]) -> bool:
+        """Whether `user_id` is still inside the read-your-writes window"""
+        if user_id is None:
+            return False
+        last_write = self._last_write.get(user_id)
+        if last_write is None:
+            return False
+        return time.monotonic() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+write_tracker = WriteTracker()
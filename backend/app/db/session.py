@@ -1,33 +1,126 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
+from typing import Optional
+import os
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
 import logging
+
 from app.core.config import settings
+from app.db import instrumentation
+from app.db.pool_metrics import get_pool_metrics, instrumented_pool_class
+from app.db.routing import write_tracker
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-try:
-    # Create database engine
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,  # Enable connection pool "pre-ping" feature
-        echo=True  # Enable SQL logging
+# Engines are created lazily, on first use or from the FastAPI lifespan hook,
+# so importing the app never touches the database and every worker process
+# builds its own pools after it has been forked.
+_engine: Optional[AsyncEngine] = None
+_replica_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+def create_engine_from_settings(url: str, name: str = "primary") -> AsyncEngine:
+    """
+    Build an async engine with the pool tuned through Settings.
+    This is the only place engines are created, so every request shares
+    the same pool configuration and the same pool metrics.
+    """
+    metrics = get_pool_metrics(name)
+    logger.info(
+        f"Creating '{name}' database engine "
+        f"(pool_size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW})"
     )
-    
-    # Test the connection
-    with engine.connect() as connection:
-        logger.info("Successfully connected to the database")
-        
-except SQLAlchemyError as e:
-    logger.error(f"Database connection error: {str(e)}")
-    raise
-
-# Create SessionLocal class with sessionmaker factory
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    expire_on_commit=False  # Prevent detached instance errors
-)
+    engine = create_async_engine(
+        url,
+        poolclass=instrumented_pool_class(metrics),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING  # Enable connection pool "pre-ping" feature
+    )
+    instrumentation.install(engine.sync_engine)
+    return engine
+
+def get_engine() -> AsyncEngine:
+    """Get the primary database engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine_from_settings(settings.ASYNC_DATABASE_URL)
+    return _engine
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """Get the read replica engine, or None when no replica is configured"""
+    global _replica_engine
+    if _replica_engine is None and settings.ASYNC_DATABASE_REPLICA_URL:
+        _replica_engine = create_engine_from_settings(settings.ASYNC_DATABASE_REPLICA_URL, name="replica")
+    return _replica_engine
+
+class RoutingSession(Session):
+    """
+    Session that picks an engine per statement.
+    Everything goes to the primary unless the session was opened for reads
+    (info["use_replica"]) and its user has not written recently. Flushes and
+    DML always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw) -> Engine:
+        replica = get_replica_engine()
+        if (
+            replica is not None
+            and self.info.get("use_replica")
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+            and not write_tracker.recently_wrote(self.info.get("user_id"))
+        ):
+            return replica.sync_engine
+        return get_engine().sync_engine
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_write(session, flush_context):
+    session.info["has_writes"] = True
+
+@event.listens_for(RoutingSession, "after_commit")
+def _start_read_your_writes_window(session):
+    if session.info.pop("has_writes", False):
+        write_tracker.mark(session.info.get("user_id"))
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session):
+    session.info.pop("has_writes", None)
+
+def get_sessionmaker() -> async_sessionmaker:
+    """Get the session factory; sessions route between primary and replica"""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            autoflush=False,
+            expire_on_commit=False  # Prevent implicit IO on attribute access after commit
+        )
+    return _sessionmaker
+
+async def dispose_engine() -> None:
+    """Close every pooled connection, e.g. on application shutdown"""
+    global _engine, _replica_engine, _sessionmaker
+    for engine in (_engine, _replica_engine):
+        if engine is not None:
+            await engine.dispose()
+    _engine = None
+    _replica_engine = None
+    _sessionmaker = None
+
+def _forget_engine_after_fork() -> None:
+    """
+    Drop the parent's engines in a freshly forked child.
+    The pooled sockets belong to the parent process, so the child must not
+    close or reuse them; it simply builds its own engines on first use.
+    """
+    global _engine, _replica_engine, _sessionmaker
+    _engine = None
+    _replica_engine = None
+    _sessionmaker = None
+
+os.register_at_fork(after_in_child=_forget_engine_after_fork)
@@ -1,24 +1,55 @@
+from contextlib import asynccontextmanager, suppress
+import asyncio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import logging
 import uvicorn
 import time
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.logger import configure_logging, stop_logging
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.security import shutdown_password_executor
+from app.db.instrumentation import report_n_plus_one, track_queries
+from app.db.session import get_engine, dispose_engine
+from app.services.report_templates import template_registry
+from app.services.autosave import autosave_buffer, run_autosave_flusher
+from app.services.generation_jobs import generation_workers
+from app.services.section_revisions import run_revision_compactor
 
 # Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create per-worker resources after the worker process has started"""
+    get_engine()
+    template_registry.load()
+    tasks = [asyncio.create_task(run_autosave_flusher())]
+    if settings.SECTION_REVISION_COMPACT_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(run_revision_compactor()))
+    generation_workers.start()
+    yield
+    # Running generation jobs go back to the queue for another process
+    await generation_workers.stop()
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Write buffered autosaves while the engine is still available
+    await autosave_buffer.flush_all()
+    await dispose_engine()
+    shutdown_password_executor()
+    metrics.mark_worker_dead()
+    stop_logging()
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     description="API for generating internship reports",
     version="1.0.0",
@@ -41,6 +72,10 @@ app = FastAPI(
         {
             "name": "references",
             "description": "Reference management operations for APA citations"
+        },
+        {
+            "name": "health",
+            "description": "Operational endpoints such as database pool metrics"
         }
     ]
 )
@@ -54,33 +89,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add request logging middleware
+# Compress large responses. Registered before the middleware below, so it runs
+# inside them and they see the final headers and body size
+app.add_middleware(CompressionMiddleware)
+
+# Add request logging middleware: one structured record per request
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log the incoming request
-    logger.info(f"Request started: {request.method} {request.url}")
-    logger.debug(f"Headers: {request.headers}")
-    
+    start_time = time.perf_counter()
     try:
         response = await call_next(request)
-        
-        # Log the response
-        process_time = time.time() - start_time
-        logger.info(
-            f"Request completed: {request.method} {request.url} "
-            f"- Status: {response.status_code} "
-            f"- Time: {process_time:.2f}s"
-        )
-        
-        return response
     except Exception as e:
-        logger.error(f"Request failed: {request.method} {request.url} - Error: {str(e)}")
+        logger.error(
+            f"Request failed: {request.method} {request.url.path} - Error: {str(e)}",
+            extra={"method": request.method, "path": request.url.path}
+        )
         raise
 
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        f"{request.method} {request.url.path} {response.status_code}",
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2)
+        }
+    )
+    return response
+
+# Per-route request counts, status codes and latency histograms for /metrics
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    metrics.IN_FLIGHT.inc()
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        metrics.IN_FLIGHT.dec()
+        metrics.observe_request(
+            request.method,
+            metrics.route_template(request),
+            status_code,
+            time.perf_counter() - start_time
+        )
+        metrics.update_pool_gauges()
+
+# Per-request SQL instrumentation: Server-Timing header, N+1 detection and
+# the statement budget each route declares
+@app.middleware("http")
+async def instrument_queries(request: Request, call_next):
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    response.headers["Server-Timing"] = stats.server_timing()
+
+    route = request.scope.get("route")
+    path = route.path if route else request.url.path
+    report_n_plus_one(stats, request.method, path)
+
+    budget = getattr(request.state, "query_budget", None)
+    if budget is not None and stats.count > budget:
+        logger.warning(
+            f"Query budget exceeded: {request.method} {path} "
+            f"issued {stats.count} queries (budget {budget})"
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"Query budget exceeded: {stats.count} > {budget}"},
+                headers={"Server-Timing": stats.server_timing()}
+            )
+    return response
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return metrics.metrics_response()
+
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
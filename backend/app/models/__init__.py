@@ -2,6 +2,8 @@ from .user import User
 from .report import Report
 from .chapter import Chapter
 from .section import Section
+from .section_revision import SectionRevision
+from .generation_job import GenerationJob
 from .file_upload import FileUpload
 from .reference import Reference
 
@@ -11,6 +13,8 @@ __all__ = [
     "Report",
     "Chapter",
     "Section",
+    "SectionRevision",
+    "GenerationJob",
     "FileUpload",
     "Reference"
 ]
\ No newline at end of file
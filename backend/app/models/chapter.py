@@ -15,7 +15,7 @@ class Chapter(Base):
     __tablename__ = "chapters"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id"), nullable=False)
+    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id"), nullable=False, index=True)
     chapter_number = Column(Integer, nullable=False)  # 1, 2, 3, etc.
     title = Column(String, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
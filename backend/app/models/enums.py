@@ -5,3 +5,19 @@ class ContentSourceType(str, Enum):
     AI_GENERATED = "ai_generated"
     USER_UPLOADED = "user_uploaded"
     MIXED = "mixed"
+
+class RevisionReason(str, Enum):
+    """What produced a section revision"""
+    BASELINE = "baseline"  # Content that existed before the section's first revision
+    EDIT = "edit"
+    GENERATE = "generate"
+    RESET = "reset"
+    RESTORE = "restore"
+
+class GenerationJobStatus(str, Enum):
+    """Lifecycle of a queued content generation"""
+    QUEUED = "queued"  # Waiting for a worker, including retries
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    CONFLICTED = "conflicted"  # Generated, but the section changed meanwhile; the result is on the job only
+    FAILED = "failed"
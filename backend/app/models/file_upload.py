@@ -14,7 +14,7 @@ class FileUpload(Base):
     __tablename__ = "file_uploads"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    section_id = Column(UUID(as_uuid=True), ForeignKey("sections.id"), nullable=False)
+    section_id = Column(UUID(as_uuid=True), ForeignKey("sections.id"), nullable=False, index=True)
     
     # File information
     filename = Column(String, nullable=False)  # Original filename
@@ -0,0 +1,48 @@
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+from app.db.base_class import Base
+from app.models.enums import GenerationJobStatus
+
+class GenerationJob(Base):
+    """
+    A queued AI generation for one section.
+    Workers claim rows with SELECT ... FOR UPDATE SKIP LOCKED (see
+    app.services.generation_jobs); the row keeps the result once it succeeds.
+    """
+    __tablename__ = "generation_jobs"
+    __table_args__ = (
+        # Claim order of waiting jobs
+        Index("ix_generation_jobs_status_run_after", "status", "run_after"),
+        # At most one waiting or running job per section
+        Index(
+            "uq_generation_jobs_active_section", "section_id", unique=True,
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
+
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    section_id = Column(PostgresUUID(as_uuid=True), ForeignKey("sections.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    provider = Column(String, nullable=False)
+
+    # Queue state
+    status = Column(String, nullable=False, default=GenerationJobStatus.QUEUED.value)  # GenerationJobStatus value
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)  # Not claimed before this (retry backoff)
+    error = Column(Text)
+
+    # Result
+    result = Column(Text)
+    word_count = Column(Integer)
+    section_version = Column(Integer)  # Section version the result was saved as
+
+    # Timestamps
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime)  # Start of the current or last attempt
+    finished_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<GenerationJob {self.id} ({self.status}) of section {self.section_id}>"
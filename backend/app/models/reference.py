@@ -15,7 +15,7 @@ class Reference(Base):
     __tablename__ = "references"
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
-    report_id = Column(PostgresUUID(as_uuid=True), ForeignKey("reports.id"))
+    report_id = Column(PostgresUUID(as_uuid=True), ForeignKey("reports.id"), index=True)
     
     # Basic citation info
     citation_key = Column(String, nullable=False)  # e.g., "Smith2023"
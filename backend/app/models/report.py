@@ -1,6 +1,6 @@
 from datetime import datetime
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 import enum
@@ -16,6 +16,10 @@ class ReportStatus(str, enum.Enum):
 class Report(Base):
     """Report model"""
     __tablename__ = "reports"
+    __table_args__ = (
+        # Serves keyset pagination of a user's reports by (updated_at, id)
+        Index("ix_reports_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
     title = Column(String, nullable=False)
@@ -24,10 +28,18 @@ class Report(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user_id = Column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    # Layout the report was created from (see app.services.report_templates)
+    template_key = Column(String, nullable=True)
+    template_version = Column(Integer, nullable=True)
 
     # Relationships
     user = relationship("User", back_populates="reports")
-    chapters = relationship("Chapter", back_populates="report", cascade="all, delete-orphan", lazy="joined")
+    chapters = relationship(
+        "Chapter",
+        back_populates="report",
+        cascade="all, delete-orphan",
+        order_by="Chapter.chapter_number"
+    )
     references = relationship("Reference", back_populates="report", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -15,7 +15,7 @@ class Section(Base):
     __tablename__ = "sections"
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
-    chapter_id = Column(PostgresUUID(as_uuid=True), ForeignKey("chapters.id"))
+    chapter_id = Column(PostgresUUID(as_uuid=True), ForeignKey("chapters.id"), index=True)
     
     # Section identifiers
     section_number = Column(String, nullable=False)  # e.g., "1.1", "1.1.1"
@@ -30,6 +30,7 @@ class Section(Base):
     
     # Metadata
     word_count = Column(Integer, default=0)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every UPDATE
     format_requirements = Column(JSON)  # Store formatting requirements
     citations = Column(JSON)  # Store citations used
     
@@ -40,6 +41,11 @@ class Section(Base):
     # Relationships
     chapter = relationship("Chapter", back_populates="sections")
     files = relationship("FileUpload", back_populates="section", cascade="all, delete-orphan")
+    # Deleted by the database with their section, never loaded for the delete
+    revisions = relationship("SectionRevision", cascade="all, delete-orphan", passive_deletes=True)
+
+    # Optimistic concurrency: UPDATEs match on the version they read and fail if it moved
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<Section {self.section_number}: {self.title}>"
@@ -0,0 +1,36 @@
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+from app.db.base_class import Base
+from app.models.enums import ContentSourceType
+
+class SectionRevision(Base):
+    """
+    One saved state of a section's content fields.
+    Rows are either full snapshots or deltas against the snapshot numbered
+    `base_number`, both zlib-compressed (see app.services.section_revisions).
+    """
+    __tablename__ = "section_revisions"
+    __table_args__ = (
+        UniqueConstraint("section_id", "revision_number", name="uq_section_revisions_section_id_number"),
+    )
+
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    section_id = Column(PostgresUUID(as_uuid=True), ForeignKey("sections.id", ondelete="CASCADE"), nullable=False)
+    revision_number = Column(Integer, nullable=False)  # 1, 2, 3... per section
+
+    # Storage
+    is_snapshot = Column(Boolean, nullable=False)
+    base_number = Column(Integer, nullable=True)  # Snapshot a delta applies to; NULL for snapshots
+    data = Column(LargeBinary, nullable=False)
+
+    # Metadata of the saved state, so listings never decode data
+    reason = Column(String, nullable=False)  # RevisionReason value
+    source_type = Column(SQLEnum(ContentSourceType), nullable=True)
+    word_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SectionRevision {self.revision_number} of section {self.section_id}>"
@@ -1,29 +1,49 @@
 from .user import UserBase, UserCreate, UserUpdate, UserResponse, UserLogin, Token, UserInDB
-from .report import ReportBase, ReportCreate, ReportUpdate, ReportInDB, ReportResponse
-from .chapter import ChapterBase, ChapterCreate, ChapterUpdate, ChapterInDB, ChapterResponse
+from .report import (
+    ReportBase, ReportCreate, ReportUpdate, ReportInDB, ReportResponse,
+    ReportSummary, ReportPage, ReportOutline, ReportInclude, ReportExclude
+)
+from .chapter import (
+    ChapterBase, ChapterCreate, ChapterUpdate, ChapterInDB, ChapterResponse,
+    ChapterOutline
+)
 from .section import (
     SectionBase, SectionCreate, SectionUpdate, SectionInDB, SectionResponse,
-    SectionContent
+    SectionContent, SectionOutline, TextEdit, SectionContentPatch,
+    SectionRevisionSummary, SectionRevisionResponse, AutosaveStatus,
+    SectionBatchAction, SectionBatchStatus, SectionBatchItem, SectionBatchRequest,
+    SectionBatchItemResult, SectionBatchResponse
 )
+from .generation_job import GenerationJobResponse
 from .file_upload import FileUploadBase, FileUploadCreate, FileUploadResponse
 from .reference import (
     ReferenceCreate, ReferenceUpdate, ReferenceInDB, ReferenceResponse,
     ReferencePageResponse
 )
+from .health import PoolMetricsResponse
 
 __all__ = [
     # User schemas
     "UserBase", "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "Token", "UserInDB",
     # Report schemas
     "ReportBase", "ReportCreate", "ReportUpdate", "ReportInDB", "ReportResponse",
+    "ReportSummary", "ReportPage", "ReportOutline", "ReportInclude", "ReportExclude",
     # Chapter schemas
     "ChapterBase", "ChapterCreate", "ChapterUpdate", "ChapterInDB", "ChapterResponse",
+    "ChapterOutline",
     # Section schemas
     "SectionBase", "SectionCreate", "SectionUpdate", "SectionInDB", "SectionResponse",
-    "SectionContent",
+    "SectionContent", "SectionOutline", "TextEdit", "SectionContentPatch",
+    "SectionRevisionSummary", "SectionRevisionResponse", "AutosaveStatus",
+    "SectionBatchAction", "SectionBatchStatus", "SectionBatchItem", "SectionBatchRequest",
+    "SectionBatchItemResult", "SectionBatchResponse",
+    # Generation job schemas
+    "GenerationJobResponse",
     # File upload schemas
     "FileUploadBase", "FileUploadCreate", "FileUploadResponse",
     # Reference schemas
     "ReferenceCreate", "ReferenceUpdate", "ReferenceInDB", "ReferenceResponse",
-    "ReferencePageResponse"
+    "ReferencePageResponse",
+    # Health schemas
+    "PoolMetricsResponse"
 ]
\ No newline at end of file
@@ -3,7 +3,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
-from app.schemas.section import SectionResponse
+from app.schemas.section import SectionResponse, SectionOutline
 
 class ChapterBase(BaseModel):
     """Base Chapter Schema"""
@@ -35,3 +35,9 @@ class ChapterResponse(ChapterInDB):
     sections: List[SectionResponse] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+class ChapterOutline(ChapterInDB):
+    """Chapter with section outlines (no section content)"""
+    sections: List[SectionOutline] = []
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,24 @@
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+from app.models.enums import GenerationJobStatus
+
+class GenerationJobResponse(BaseModel):
+    """Schema for reading a content generation job"""
+    id: UUID
+    section_id: UUID
+    provider: str
+    status: GenerationJobStatus
+    attempts: int = Field(..., description="Attempts started so far, including the running one")
+    error: Optional[str] = Field(None, description="Error of the last failed attempt")
+    result: Optional[str] = Field(None, description="Generated content, once the job succeeded or conflicted")
+    word_count: Optional[int] = None
+    section_version: Optional[int] = Field(None, description="Section version the result was saved as")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
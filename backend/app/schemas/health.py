@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+
+class PoolMetricsResponse(BaseModel):
+    """Connection pool metrics for one engine in the answering worker"""
+    name: str = Field(..., description="Engine name (e.g. 'primary')")
+    pid: int = Field(..., description="Worker process that served the request")
+    size: int = Field(..., description="Configured pool size")
+    checked_out: int = Field(..., description="Connections currently in use")
+    checked_in: int = Field(..., description="Idle connections held by the pool")
+    overflow: int = Field(..., description="Connections currently open beyond pool size")
+    checkouts: int = Field(..., description="Total connection checkouts")
+    connects: int = Field(..., description="Total new connections opened")
+    overflow_hits: int = Field(..., description="Checkouts that had to open an overflow connection")
+    timeouts: int = Field(..., description="Checkouts that gave up after DB_POOL_TIMEOUT")
+    wait_count: int = Field(..., description="Number of timed checkouts")
+    wait_seconds_total: float = Field(..., description="Total time spent waiting for a connection")
+    wait_seconds_avg: float = Field(..., description="Average wait per checkout")
+    wait_seconds_max: float = Field(..., description="Longest single wait")
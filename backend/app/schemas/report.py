@@ -2,9 +2,10 @@ from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict
+import enum
 
 from app.models.report import ReportStatus
-from app.schemas.chapter import ChapterResponse
+from app.schemas.chapter import ChapterResponse, ChapterOutline
 from app.schemas.reference import ReferenceResponse
 
 class ReportBase(BaseModel):
@@ -30,6 +31,8 @@ class ReportInDB(ReportBase):
     status: ReportStatus
     created_at: datetime
     updated_at: datetime
+    template_key: Optional[str] = None
+    template_version: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -40,3 +43,42 @@ class ReportResponse(ReportInDB):
     status: str  # Changed to str to avoid validation issues
 
     model_config = ConfigDict(from_attributes=True)
+
+class ReportOutline(ReportInDB):
+    """Report with chapter and section outlines (no section content)"""
+    chapters: List[ChapterOutline] = []
+    references: List[ReferenceResponse] = []
+    status: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReportInclude(str, enum.Enum):
+    """Optional parts of a report read, requested with ?include="""
+    CONTENT = "content"  # user_content, ai_content and final_content of every section
+    REFERENCES = "references"  # Returned by default; accepted for clients that ask for them explicitly
+
+class ReportExclude(str, enum.Enum):
+    """Default parts of a report read a client can leave out, with ?exclude="""
+    REFERENCES = "references"
+
+class ReportSummary(BaseModel):
+    """Lightweight report row for listings (no chapter or section content)"""
+    id: UUID
+    title: str
+    department: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    chapter_count: int = Field(0, description="Number of chapters in the report")
+    section_count: int = Field(0, description="Number of sections in the report")
+    total_words: int = Field(0, description="Sum of section word counts")
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReportPage(BaseModel):
+    """One page of report summaries"""
+    items: List[ReportSummary] = []
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page; null on the last page"
+    )
@@ -1,9 +1,10 @@
-from typing import Optional, Dict, Any
+from typing import List, Optional, Dict, Any
 from uuid import UUID
 from pydantic import BaseModel, Field
 from datetime import datetime
+import enum
 
-from app.models.enums import ContentSourceType
+from app.models.enums import ContentSourceType, RevisionReason
 
 class SectionBase(BaseModel):
     """Base Section Schema"""
@@ -25,6 +26,17 @@ class SectionContent(BaseModel):
     """Schema for section content operations"""
     content: str = Field(..., description="Content text for the section")
 
+class TextEdit(BaseModel):
+    """Replace characters [start, end) of the base text with `text`"""
+    start: int = Field(..., ge=0, description="Offset (in characters) where the replaced range starts")
+    end: int = Field(..., ge=0, description="Offset (in characters) just past the replaced range; equal to start for an insert")
+    text: str = Field("", description="Replacement text; empty for a deletion")
+
+class SectionContentPatch(BaseModel):
+    """Schema for incremental section content updates"""
+    base_version: int = Field(..., description="Section version the edits were made against")
+    edits: List[TextEdit] = Field(..., min_length=1, max_length=1000, description="Edits sorted by start, not overlapping")
+
 class SectionInDB(SectionBase):
     """Schema for section in database"""
     id: UUID
@@ -34,6 +46,7 @@ class SectionInDB(SectionBase):
     final_content: Optional[str] = None
     source_type: ContentSourceType = ContentSourceType.USER_UPLOADED
     word_count: int = 0
+    version: int = 1
     created_at: datetime
     updated_at: datetime
 
@@ -43,3 +56,88 @@ class SectionInDB(SectionBase):
 class SectionResponse(SectionInDB):
     """Schema for reading section data"""
     has_files: bool = False
+
+class SectionOutline(SectionBase):
+    """Section without its content columns, for navigation views"""
+    id: UUID
+    chapter_id: UUID
+    source_type: ContentSourceType = ContentSourceType.USER_UPLOADED
+    word_count: int = 0
+    version: int = 1
+    created_at: datetime
+    updated_at: datetime
+    has_files: bool = False
+
+    class Config:
+        from_attributes = True
+
+class SectionRevisionSummary(BaseModel):
+    """Revision metadata, as listed by GET /sections/{id}/revisions"""
+    revision_number: int
+    reason: RevisionReason
+    source_type: Optional[ContentSourceType] = None
+    word_count: int = 0
+    is_snapshot: bool = Field(..., description="Stored in full rather than as a delta")
+    stored_bytes: int = Field(..., description="Compressed size of the stored revision")
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SectionRevisionResponse(BaseModel):
+    """A revision with its content rebuilt"""
+    section_id: UUID
+    revision_number: int
+    reason: RevisionReason
+    source_type: Optional[ContentSourceType] = None
+    word_count: int = 0
+    created_at: datetime
+    user_content: Optional[str] = None
+    ai_content: Optional[str] = None
+    final_content: Optional[str] = None
+
+class AutosaveStatus(BaseModel):
+    """What is buffered and what is durably saved for a section"""
+    section_id: UUID
+    pending: bool = Field(..., description="An autosave is buffered and not yet written")
+    pending_since: Optional[datetime] = Field(None, description="When the oldest buffered autosave arrived")
+    saved_version: int = Field(..., description="Section version durably stored in the database")
+    saved_at: datetime = Field(..., description="updated_at of the durably stored section")
+
+class SectionBatchAction(str, enum.Enum):
+    """Operation applied to one section of a batch"""
+    CONTENT = "content"  # Same as POST /sections/{id}/content
+    RESET = "reset"  # Same as POST /sections/{id}/reset
+
+class SectionBatchStatus(str, enum.Enum):
+    """Outcome of one batch item"""
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
+
+class SectionBatchItem(BaseModel):
+    """One section update in a batch"""
+    section_id: UUID
+    action: SectionBatchAction = SectionBatchAction.CONTENT
+    content: Optional[str] = Field(None, description="New content; required for the content action")
+    base_version: Optional[int] = Field(None, description="Apply only if the section is still at this version")
+
+class SectionBatchRequest(BaseModel):
+    """Schema for batch section updates"""
+    items: List[SectionBatchItem] = Field(..., min_length=1, max_length=200)
+
+class SectionBatchItemResult(BaseModel):
+    """Result of one batch item, in request order"""
+    section_id: UUID
+    status: SectionBatchStatus
+    version: Optional[int] = Field(None, description="Section version after the batch")
+    word_count: Optional[int] = None
+    updated_at: Optional[datetime] = None
+    detail: Optional[str] = None
+
+class SectionBatchResponse(BaseModel):
+    """Schema for batch section update results"""
+    results: List[SectionBatchItemResult]
@@ -0,0 +1,181 @@
+"""
+Write-behind buffer for editor autosaves.
+
+Editors autosave every few seconds, and a direct POST /content costs an
+UPDATE, a revision and a refresh each time. PUT /sections/{id}/autosave
+instead stores the latest text in this per-process buffer. The buffer
+writes it once the section's first pending save is AUTOSAVE_WINDOW_SECONDS
+old, so any number of saves inside one window become a single write (and a
+single revision).
+
+Pending saves are flushed early:
+
+- before the same user's reads and other writes (see deps.flush_autosaves),
+  so nobody reads or edits behind a pending save;
+- at shutdown, from the lifespan.
+
+A flush of one section holds that section's lock, so flushes of the same
+section never overlap or reorder. A flush that fails, e.g. because another
+request wrote the section at the same moment, keeps the save buffered for
+the next tick; the read that triggered it goes ahead rather than failing. Anything still buffered when a process
+dies is lost (at most one window of typing), and the buffer is per worker
+process, so autosaves and reads should reach the same worker. The
+autosave endpoints report the durable version next to the pending state.
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.instrumentation import track_queries
+from app.db.session import get_sessionmaker
+from app.models.enums import RevisionReason
+from app.models.section import Section
+from app.services.section_revisions import record_revision
+
+logger = logging.getLogger(__name__)
+
+class AutosaveConflict(Exception):
+    """A written-through save raced another write of the section and was dropped"""
+
+@dataclass
+class PendingSave:
+    """Latest unsaved content of one section"""
+    user_id: Hashable
+    content: str
+    first_at: float  # time.monotonic() of the first save in the window
+    pending_since: datetime
+    saves: int = 1
+
+class AutosaveBuffer:
+    """Per-process map of section id -> PendingSave"""
+
+    def __init__(self, window_seconds: float, max_pending: int):
+        self.window_seconds = window_seconds
+        self.max_pending = max_pending
+        self._pending: Dict[UUID, PendingSave] = {}
+        self._locks: Dict[UUID, Tuple[asyncio.Lock, int]] = {}
+
+    def pending(self, section_id: UUID) -> Optional[PendingSave]:
+        return self._pending.get(section_id)
+
+    async def save(self, section_id: UUID, user_id: Hashable, content: str) -> bool:
+        """
+        Buffer the latest content of a section. Returns False when it was
+        written through instead, because the buffer is full or disabled.
+        """
+        metrics.AUTOSAVE_EDITS.inc()
+        entry = self._pending.get(section_id)
+        if entry is not None:
+            entry.content = content
+            entry.saves += 1
+            return True
+        entry = PendingSave(user_id, content, time.monotonic(), datetime.utcnow())
+        self._pending[section_id] = entry
+        if self.window_seconds <= 0 or len(self._pending) > self.max_pending:
+            try:
+                await self.flush_section(section_id)
+            except (StaleDataError, IntegrityError) as e:
+                # The caller answers with a conflict, so the save must not be written later
+                if self._pending.get(section_id) is entry:
+                    del self._pending[section_id]
+                raise AutosaveConflict(str(section_id)) from e
+            return False
+        return True
+
+    async def flush_section(self, section_id: UUID) -> None:
+        """Write a section's pending save, if any, and wait for any flush already running"""
+        async with self._section_lock(section_id):
+            entry = self._pending.pop(section_id, None)
+            if entry is None:
+                return
+            try:
+                await _write(section_id, entry)
+            except BaseException as e:
+                # Keep it for the next attempt unless a newer save arrived meanwhile;
+                # this includes cancellation, e.g. of the flusher at shutdown
+                self._pending.setdefault(section_id, entry)
+                if not isinstance(e, asyncio.CancelledError):
+                    logger.error(f"Autosave flush of section {section_id} failed: {str(e)}", exc_info=True)
+                raise
+
+    async def flush_user(self, user_id: Hashable) -> None:
+        """Write every pending save of one user; failed saves stay buffered for the flusher"""
+        for section_id in [sid for sid, entry in self._pending.items() if entry.user_id == user_id]:
+            try:
+                await self.flush_section(section_id)
+            except Exception:
+                pass  # Logged by flush_section; retried on the next tick
+
+    async def flush_due(self) -> None:
+        """Write the saves whose window has closed"""
+        deadline = time.monotonic() - self.window_seconds
+        for section_id in [sid for sid, entry in self._pending.items() if entry.first_at <= deadline]:
+            try:
+                await self.flush_section(section_id)
+            except Exception:
+                pass  # Logged by flush_section; retried on the next tick
+
+    async def flush_all(self) -> None:
+        """Write everything, e.g. at shutdown"""
+        for section_id in list(self._pending):
+            try:
+                await self.flush_section(section_id)
+            except Exception:
+                pass
+
+    @asynccontextmanager
+    async def _section_lock(self, section_id: UUID) -> AsyncIterator[None]:
+        # Reference-counted so the lock of an idle section is dropped
+        lock, users = self._locks.get(section_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[section_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[section_id]
+            if users == 1:
+                del self._locks[section_id]
+            else:
+                self._locks[section_id] = (lock, users - 1)
+
+async def _write(section_id: UUID, entry: PendingSave) -> None:
+    """Apply a pending save like POST /content would"""
+    # Counted on its own, not against the budget of the request that triggered it
+    with track_queries():
+        async with get_sessionmaker()() as db:
+            db.info["user_id"] = entry.user_id  # Keeps the user's next reads on the primary
+            section = await db.get(Section, section_id)
+            if section is None:
+                return
+            section.user_content = entry.content
+            section.final_content = entry.content
+            section.word_count = len(entry.content.split())
+            await record_revision(db, section, RevisionReason.EDIT)
+            await db.commit()
+    metrics.AUTOSAVE_FLUSHES.inc()
+    logger.debug(f"Flushed {entry.saves} autosaves of section {section_id}")
+
+autosave_buffer = AutosaveBuffer(
+    window_seconds=settings.AUTOSAVE_WINDOW_SECONDS,
+    max_pending=settings.AUTOSAVE_MAX_PENDING
+)
+
+async def run_autosave_flusher() -> None:
+    """Flush saves as their windows close, until cancelled"""
+    tick = min(1.0, max(settings.AUTOSAVE_WINDOW_SECONDS / 4, 0.05))
+    while True:
+        await asyncio.sleep(tick)
+        await autosave_buffer.flush_due()
@@ -0,0 +1,353 @@
+"""
+Queue of content generation jobs.
+
+POST /sections/{id}/generate only inserts a GenerationJob row and returns
+202, so no request (and no database connection) waits for a model. Worker
+tasks started from the lifespan (GENERATION_WORKERS per process) claim jobs
+with UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED LIMIT 1), so
+any number of workers in any number of processes share the table without
+claiming the same job twice. A job is processed in three steps, and no
+connection is held during the provider call:
+
+1. a short session reads the section and builds its generation context;
+2. the provider generates, limited per provider and process to
+   GENERATION_CONCURRENCY calls (GENERATION_PROVIDER_CONCURRENCY overrides
+   it per provider) and to GENERATION_TIMEOUT_SECONDS;
+3. one transaction saves the content on the section like the old inline
+   endpoint did, records a "generate" revision and stores the result on
+   the job. If the section was written after step 1 read it, the user's
+   edit wins: the result is stored on the job only, which ends conflicted.
+
+Failed attempts are retried after GENERATION_RETRY_DELAY_SECONDS times the
+attempt number, up to GENERATION_MAX_ATTEMPTS. A job still running after
+GENERATION_LEASE_SECONDS is assumed lost with its worker and claimed again;
+the attempt number is the lease, so a worker that lost its job can no
+longer save it. A partial unique index keeps one active job per section, and
+enqueueing returns the active job if there is one.
+"""
+
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+import asyncio
+import logging
+import time
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.content_generation import build_section_context, get_provider, provider_names
+from app.db.session import get_sessionmaker
+from app.models.chapter import Chapter
+from app.models.enums import GenerationJobStatus, RevisionReason
+from app.models.generation_job import GenerationJob
+from app.models.section import Section
+from app.services.section_revisions import record_revision
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (GenerationJobStatus.QUEUED.value, GenerationJobStatus.RUNNING.value)
+
+# Insert-or-select rounds before enqueue_generation gives up on a contended section
+ENQUEUE_ATTEMPTS = 3
+
+class JobLost(Exception):
+    """The job was claimed again by another worker after its lease ran out"""
+
+class EnqueueConflict(Exception):
+    """The section's active job kept changing while enqueueing"""
+
+async def enqueue_generation(
+    db: AsyncSession, section_id: UUID, user_id: UUID, provider: Optional[str] = None
+) -> GenerationJob:
+    """
+    Queue a generation of a section and commit; returns the section's active
+    job instead if it already has one. KeyError for an unknown provider,
+    EnqueueConflict if neither could be done in ENQUEUE_ATTEMPTS rounds.
+    """
+    provider = get_provider(provider).name
+    for _ in range(ENQUEUE_ATTEMPTS):
+        now = datetime.utcnow()
+        job = await db.scalar(
+            insert(GenerationJob)
+            .values(
+                id=uuid4(), section_id=section_id, user_id=user_id, provider=provider,
+                status=GenerationJobStatus.QUEUED.value, attempts=0, run_after=now, created_at=now
+            )
+            .on_conflict_do_nothing(
+                index_elements=[GenerationJob.section_id],
+                index_where=GenerationJob.status.in_(ACTIVE_STATUSES)
+            )
+            .returning(GenerationJob)
+        )
+        if job is None:
+            # The active job that blocked the insert may have finished since; then insert again
+            job = await get_active_job(db, section_id)
+        if job is not None:
+            await db.commit()
+            generation_workers.notify()
+            return job
+    await db.rollback()
+    raise EnqueueConflict(f"Section {section_id} is being queued by another request; retry")
+
+async def get_active_job(db: AsyncSession, section_id: UUID) -> Optional[GenerationJob]:
+    """The section's queued or running job, if any"""
+    return await db.scalar(
+        select(GenerationJob)
+        .where(GenerationJob.section_id == section_id, GenerationJob.status.in_(ACTIVE_STATUSES))
+    )
+
+async def list_section_jobs(db: AsyncSession, section_id: UUID, limit: int = 20) -> List[GenerationJob]:
+    """Newest jobs of a section first"""
+    result = await db.scalars(
+        select(GenerationJob)
+        .where(GenerationJob.section_id == section_id)
+        .order_by(GenerationJob.created_at.desc())
+        .limit(limit)
+    )
+    return list(result)
+
+def _owned_by(job: GenerationJob):
+    # The attempt number is the lease: it changes whenever the job is claimed
+    return and_(
+        GenerationJob.id == job.id,
+        GenerationJob.status == GenerationJobStatus.RUNNING.value,
+        GenerationJob.attempts == job.attempts
+    )
+
+class GenerationWorkerPool:
+    """Worker tasks of one process and the per-provider limits they share"""
+
+    def __init__(self, workers: int, default_limit: int, limits: Dict[str, int], poll_seconds: float):
+        self.workers = workers
+        self.default_limit = default_limit
+        self.limits = limits
+        self.poll_seconds = poll_seconds
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(index)) for index in range(self.workers)]
+        logger.info(f"Started {self.workers} generation workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake an idle worker of this process, e.g. after enqueueing"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Limit of concurrent calls to a provider in this process, shared with streamed generation"""
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limits.get(provider, self.default_limit))
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    async def _work(self, index: int) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Generation worker {index} could not claim a job: {str(e)}", exc_info=True)
+                job = None
+            if job is None:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            await self._process(job)
+
+    async def _claim(self) -> Optional[GenerationJob]:
+        """Take the next due job of a provider this process has capacity for"""
+        # Providers at their limit are skipped, so their jobs stay claimable by other processes
+        providers = [name for name in provider_names() if not self.semaphore(name).locked()]
+        if not providers:
+            return None
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=settings.GENERATION_LEASE_SECONDS)
+        next_job = (
+            select(GenerationJob.id)
+            .where(
+                GenerationJob.provider.in_(providers),
+                or_(
+                    and_(GenerationJob.status == GenerationJobStatus.QUEUED.value, GenerationJob.run_after <= now),
+                    and_(GenerationJob.status == GenerationJobStatus.RUNNING.value, GenerationJob.started_at < lease_expired)
+                )
+            )
+            .order_by(GenerationJob.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with get_sessionmaker()() as db:
+            job = await db.scalar(
+                update(GenerationJob)
+                .where(GenerationJob.id == next_job)
+                .values(
+                    status=GenerationJobStatus.RUNNING.value,
+                    attempts=GenerationJob.attempts + 1,
+                    started_at=now
+                )
+                .returning(GenerationJob)
+            )
+            await db.commit()
+            return job
+
+    async def _process(self, job: GenerationJob) -> None:
+        try:
+            if job.attempts > settings.GENERATION_MAX_ATTEMPTS:
+                # Lost too many times, e.g. it keeps crashing its worker
+                raise RuntimeError(f"Gave up after {job.attempts - 1} attempts")
+            content, base_version = await self._generate(job)
+            status = await _save_result(job, content, base_version)
+            metrics.GENERATION_JOBS.labels(job.provider, status.value).inc()
+        except asyncio.CancelledError:
+            # Shutdown: hand the job back without counting the attempt
+            with suppress(Exception):
+                await _requeue(job)
+            raise
+        except JobLost:
+            logger.warning(f"Generation job {job.id} was claimed by another worker; dropping this attempt")
+        except Exception as e:
+            retry = job.attempts < settings.GENERATION_MAX_ATTEMPTS
+            logger.error(
+                f"Generation job {job.id} attempt {job.attempts} failed"
+                f"{', retrying' if retry else ''}: {str(e)}", exc_info=True
+            )
+            metrics.GENERATION_JOBS.labels(job.provider, "retried" if retry else "failed").inc()
+            error = str(e) or type(e).__name__
+            with suppress(Exception):
+                await (_requeue(job, error) if retry else _fail(job, error))
+
+    async def _generate(self, job: GenerationJob) -> Tuple[str, int]:
+        """The generated content and the section version its context was built from"""
+        # 1. Context, from a session that is closed before the provider runs
+        async with get_sessionmaker()() as db:
+            section = await db.scalar(
+                select(Section)
+                .options(joinedload(Section.chapter).joinedload(Chapter.report))
+                .where(Section.id == job.section_id)
+            )
+            if section is None:
+                raise LookupError("Section no longer exists")
+            context = build_section_context(section)
+            base_version = section.version
+
+        # 2. Provider call, within the provider's limit
+        provider = get_provider(job.provider)
+        async with self.semaphore(job.provider):
+            metrics.GENERATION_RUNNING.labels(job.provider).inc()
+            start = time.perf_counter()
+            try:
+                content = await asyncio.wait_for(provider.generate(context), settings.GENERATION_TIMEOUT_SECONDS)
+            finally:
+                metrics.GENERATION_RUNNING.labels(job.provider).dec()
+                metrics.GENERATION_DURATION.labels(job.provider).observe(time.perf_counter() - start)
+        return content, base_version
+
+async def _save_result(job: GenerationJob, content: str, base_version: int) -> GenerationJobStatus:
+    """
+    3. Save the content on the section, with a revision, and complete the job
+    in one transaction. When the section is no longer at base_version the
+    content is only stored on the job, which ends CONFLICTED; returns the
+    job's final status.
+    """
+    async with get_sessionmaker()() as db:
+        db.info["user_id"] = job.user_id  # Keeps the user's next reads on the primary
+        section = await db.get(Section, job.section_id)
+        if section is None:
+            raise LookupError("Section no longer exists")
+        status = GenerationJobStatus.CONFLICTED
+        if section.version == base_version:
+            section.ai_content = content
+            section.final_content = content  # Set as final content
+            section.word_count = len(content.split())
+            try:
+                await record_revision(db, section, RevisionReason.GENERATE)
+                await db.flush()  # Bumps section.version, unless another write got there first
+                status = GenerationJobStatus.SUCCEEDED
+            except StaleDataError:
+                await db.rollback()
+        if status == GenerationJobStatus.SUCCEEDED:
+            values = dict(section_version=section.version, error=None)
+        else:
+            values = dict(section_version=None, error="Section was modified during generation; the result was not applied")
+        result = await db.execute(
+            update(GenerationJob)
+            .where(_owned_by(job))
+            .values(
+                status=status.value,
+                result=content,
+                word_count=len(content.split()),
+                finished_at=datetime.utcnow(),
+                **values
+            )
+        )
+        if result.rowcount == 0:
+            await db.rollback()
+            raise JobLost()
+        await db.commit()
+    if status == GenerationJobStatus.SUCCEEDED:
+        logger.info(f"Generation job {job.id} saved section {job.section_id} as version {section.version}")
+    else:
+        logger.info(f"Generation job {job.id} kept its result: section {job.section_id} changed during generation")
+    return status
+
+async def _requeue(job: GenerationJob, error: Optional[str] = None) -> None:
+    """
+    Queue the job again: after a backoff when retrying a failed attempt, or
+    at once and without counting the attempt when it was interrupted
+    """
+    if error is None:
+        values = dict(attempts=GenerationJob.attempts - 1)
+    else:
+        delay = timedelta(seconds=settings.GENERATION_RETRY_DELAY_SECONDS * job.attempts)
+        values = dict(run_after=datetime.utcnow() + delay, error=error)
+    async with get_sessionmaker()() as db:
+        await db.execute(
+            update(GenerationJob)
+            .where(_owned_by(job))
+            .values(status=GenerationJobStatus.QUEUED.value, **values)
+        )
+        await db.commit()
+
+async def _fail(job: GenerationJob, error: str) -> None:
+    async with get_sessionmaker()() as db:
+        await db.execute(
+            update(GenerationJob)
+            .where(_owned_by(job))
+            .values(status=GenerationJobStatus.FAILED.value, error=error, finished_at=datetime.utcnow())
+        )
+        await db.commit()
+
+def _provider_limits(spec: str) -> Dict[str, int]:
+    """Parse "name=N,name=N" into a dict"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, limit = item.partition("=")
+        limits[name.strip()] = int(limit)
+    return limits
+
+generation_workers = GenerationWorkerPool(
+    workers=settings.GENERATION_WORKERS,
+    default_limit=settings.GENERATION_CONCURRENCY,
+    limits=_provider_limits(settings.GENERATION_PROVIDER_CONCURRENCY),
+    poll_seconds=settings.GENERATION_POLL_SECONDS
+)
@@ -0,0 +1,157 @@
+"""
+Streamed section generation.
+
+POST /sections/{id}/generate/stream sends the provider's output as
+Server-Sent Events while it is produced, so the first words arrive after
+one provider chunk instead of after the whole section:
+
+    event: start   {"section_id", "provider"}
+    event: chunk   {"text"}                  one per provider chunk
+    event: done    {"version", "word_count"}
+    event: error   {"detail"}
+
+The stream cannot use the request's session, which is closed before the
+body is sent, and holds no connection while the provider runs: each save
+opens its own short session. Every GENERATION_STREAM_SAVE_SECONDS the text
+so far is saved to ai_content, and after a disconnect or a provider error
+whatever was produced is saved the same way, so no work is lost. When the
+provider finishes, ai_content, final_content and word_count are saved
+together with a "generate" revision, like a generation job. Partial saves
+add no revisions; if the section had none yet, the content it had before
+the stream becomes the baseline revision.
+
+Provider calls count against the same per-provider limit as the workers in
+app.services.generation_jobs.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+import anyio
+import orjson
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.content_generation import GenerationProvider, build_section_context
+from app.db.instrumentation import track_queries
+from app.db.session import get_sessionmaker
+from app.models.enums import RevisionReason
+from app.models.section import Section
+from app.services.generation_jobs import generation_workers
+from app.services.section_revisions import RevisionChange, record_revisions, section_state
+
+logger = logging.getLogger(__name__)
+
+# Keep proxies from buffering the stream or caching it
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _event(name: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + name.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+async def _save(
+    section_id: UUID, user_id: UUID, content: str, before: Optional[RevisionChange] = None
+) -> Optional[Section]:
+    """
+    Save streamed text to ai_content. The final save passes `before`, the
+    section as it was when the stream started, and also sets final_content,
+    word_count and the revision.
+    """
+    # Counted on its own, not against the budget of the request that started the stream
+    with track_queries():
+        async with get_sessionmaker()() as db:
+            db.info["user_id"] = user_id  # Keeps the user's next reads on the primary
+            section = await db.get(Section, section_id)
+            if section is None:
+                return None
+            section.ai_content = content
+            if before is not None:
+                section.final_content = content  # Set as final content
+                section.word_count = len(content.split())
+                # Compared with the pre-stream state, which the partial saves already overwrote
+                before.state = section_state(section)
+                before.source_type = section.source_type
+                before.word_count = section.word_count
+                await record_revisions(db, [before], [RevisionReason.GENERATE])
+            await db.commit()
+            return section
+
+async def _save_partial(section_id: UUID, user_id: UUID, content: str) -> None:
+    try:
+        await _save(section_id, user_id, content)
+    except StaleDataError:
+        # Another write landed in between; the next save or the final one catches up
+        logger.debug(f"Skipped a partial save of section {section_id} that raced another write")
+
+def stream_section_generation(section: Section, user_id: UUID, provider: GenerationProvider) -> AsyncIterator[bytes]:
+    """
+    SSE body of a streamed generation of `section` (with section.chapter.report
+    loaded), saving the output as it goes. Everything needed from the section
+    is read here, before the request's session goes away.
+    """
+    before = RevisionChange(
+        section_id=section.id,
+        previous=section_state(section),
+        state={},
+        source_type=section.source_type,
+        word_count=section.word_count,
+        previous_source_type=section.source_type,
+        previous_word_count=section.word_count or 0
+    )
+    return _stream(section.id, user_id, provider, build_section_context(section), before)
+
+async def _stream(
+    section_id: UUID, user_id: UUID, provider: GenerationProvider, context: Dict[str, Any], before: RevisionChange
+) -> AsyncIterator[bytes]:
+    yield _event("start", {"section_id": str(section_id), "provider": provider.name})
+    parts: List[str] = []
+    saved = 0  # len(parts) at the last save
+    try:
+        async with generation_workers.semaphore(provider.name):
+            metrics.GENERATION_RUNNING.labels(provider.name).inc()
+            start = last_save = time.perf_counter()
+            try:
+                chunks = provider.stream(context).__aiter__()
+                while True:
+                    try:
+                        # The timeout bounds the wait for each chunk, not the whole stream
+                        chunk = await asyncio.wait_for(chunks.__anext__(), settings.GENERATION_TIMEOUT_SECONDS)
+                    except StopAsyncIteration:
+                        break
+                    parts.append(chunk)
+                    yield _event("chunk", {"text": chunk})
+                    if time.perf_counter() - last_save >= settings.GENERATION_STREAM_SAVE_SECONDS:
+                        await _save_partial(section_id, user_id, "".join(parts))
+                        saved = len(parts)
+                        last_save = time.perf_counter()
+            finally:
+                metrics.GENERATION_RUNNING.labels(provider.name).dec()
+                metrics.GENERATION_DURATION.labels(provider.name).observe(time.perf_counter() - start)
+
+        content = "".join(parts)
+        section = await _save(section_id, user_id, content, before)
+        saved = len(parts)
+        if section is None:
+            yield _event("error", {"detail": "Section no longer exists"})
+            return
+        logger.info(f"Streamed generation saved section {section_id} as version {section.version}")
+        yield _event("done", {"version": section.version, "word_count": section.word_count})
+    except (asyncio.CancelledError, GeneratorExit):
+        # Client disconnected: keep what was produced. The save runs shielded
+        # because the response's cancel scope is already cancelled.
+        if len(parts) > saved:
+            with anyio.CancelScope(shield=True):
+                await _save_partial(section_id, user_id, "".join(parts))
+        logger.info(f"Streamed generation of section {section_id} ended by the client after {len(parts)} chunks")
+        raise
+    except Exception as e:
+        logger.error(f"Streamed generation of section {section_id} failed: {str(e)}", exc_info=True)
+        if len(parts) > saved:
+            try:
+                await _save_partial(section_id, user_id, "".join(parts))
+            except Exception as save_error:
+                logger.error(f"Could not save partial output of section {section_id}: {str(save_error)}")
+        yield _event("error", {"detail": str(e) or type(e).__name__})
@@ -1,29 +1,94 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
 from uuid import UUID
+import base64
+import binascii
+import json
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import String, cast, delete, insert, literal, select, func, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, noload, selectinload
 import logging
 
 from app.models.report import Report, ReportStatus
 from app.models.chapter import Chapter
 from app.models.section import Section
-from app.schemas.report import ReportCreate, ReportUpdate
+from app.models.reference import Reference
+from app.models.file_upload import FileUpload
+from app.models.section_revision import SectionRevision
+from app.core.report_cache import report_cache
+from app.schemas.report import ReportCreate, ReportUpdate, ReportSummary
+from app.services.report_templates import template_registry
 
 # Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Loader strategy for everything ReportResponse serializes. Each level is
+# fetched with one SELECT ... WHERE parent_id IN (...), so loading a report
+# (or a whole list of reports) costs a fixed 4 queries instead of one query
+# per chapter. Lazy loading is not available on an AsyncSession anyway.
+REPORT_TREE_OPTIONS = (
+    selectinload(Report.chapters).selectinload(Chapter.sections),
+    selectinload(Report.references),
+)
+
+# Large Text columns skipped by outline reads (see report_tree_options)
+SECTION_CONTENT_COLUMNS = (Section.user_content, Section.ai_content, Section.final_content)
+
+def _with_content(sections_loader, include_content: bool):
+    """Defer the section content columns on a loader unless content was requested"""
+    if include_content:
+        return sections_loader
+    return sections_loader.options(*(defer(column) for column in SECTION_CONTENT_COLUMNS))
+
+def report_tree_options(include_content: bool = False, include_references: bool = False) -> tuple:
+    """
+    Loader options for a report read that only fetches the requested parts.
+    Section content columns are deferred and references are not queried at
+    all unless asked for, so outline reads stay small in both DB I/O and
+    response size.
+    """
+    return (
+        _with_content(selectinload(Report.chapters).selectinload(Chapter.sections), include_content),
+        selectinload(Report.references) if include_references else noload(Report.references),
+    )
+
+def encode_report_cursor(updated_at: datetime, report_id: UUID) -> str:
+    """Encode the (updated_at, id) keyset position of the last row on a page"""
+    raw = json.dumps({"u": updated_at.isoformat(), "i": str(report_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_report_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_report_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["u"]), UUID(data["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _digest(id_column, marker_column):
+    """md5 over every row's "id:marker", in id order, as an aggregate"""
+    row = func.concat(cast(id_column, String), ":", cast(marker_column, String))
+    return func.md5(func.string_agg(row, aggregate_order_by(literal(","), id_column)))
+
 class ReportService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_report(self, report_id: UUID, user_id: UUID) -> Optional[Report]:
+    async def get_report(self, report_id: UUID, user_id: UUID, options=REPORT_TREE_OPTIONS) -> Optional[Report]:
         """Get a specific report by ID"""
         logger.debug(f"Getting report with ID: {report_id}, user ID: {user_id}")
-        report = self.db.query(Report).filter(
-            Report.id == report_id,
-            Report.user_id == user_id
-        ).first()
+        result = await self.db.execute(
+            select(Report)
+            .options(*options)
+            .where(Report.id == report_id, Report.user_id == user_id)
+        )
+        report = result.unique().scalar_one_or_none()
         
         if not report:
             logger.error(f"Report not found with ID: {report_id}, user ID: {user_id}")
@@ -34,178 +99,269 @@ class ReportService:
         logger.debug(f"Found report with ID: {report_id}, user ID: {user_id}")
         return report
 
-    def list_user_reports(self, user_id: UUID) -> List[Report]:
+    async def list_user_reports(self, user_id: UUID) -> List[Report]:
         """List all reports for a user"""
         logger.debug(f"Listing reports for user ID: {user_id}")
-        reports = self.db.query(Report).filter(Report.user_id == user_id).all()
+        result = await self.db.execute(
+            select(Report)
+            .options(*REPORT_TREE_OPTIONS)
+            .where(Report.user_id == user_id)
+        )
+        reports = result.unique().scalars().all()
         logger.debug(f"Found {len(reports)} reports for user ID: {user_id}")
         return reports
 
-    def create_report(self, report_in: ReportCreate, user_id: UUID) -> Report:
-        """Create a new report with predefined chapters and sections"""
+    async def list_user_report_summaries(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        status_filter: Optional[ReportStatus] = None,
+        department: Optional[str] = None
+    ) -> Tuple[List[ReportSummary], Optional[str]]:
+        """
+        List one page of report summaries, newest first.
+        Pages are keyed on (updated_at, id) so every page costs the same
+        regardless of depth, and only counts are read from chapters and
+        sections, never their content.
+        """
+        logger.debug(f"Listing report summaries for user ID: {user_id}, cursor: {cursor}")
+        page = select(
+            Report.id,
+            Report.title,
+            Report.department,
+            Report.status,
+            Report.created_at,
+            Report.updated_at
+        ).where(Report.user_id == user_id)
+
+        if status_filter is not None:
+            page = page.where(Report.status == status_filter.value)
+        if department is not None:
+            page = page.where(Report.department == department)
+        if cursor is not None:
+            after_updated_at, after_id = decode_report_cursor(cursor)
+            page = page.where(tuple_(Report.updated_at, Report.id) < tuple_(after_updated_at, after_id))
+
+        # Fetch one extra row to know whether another page follows
+        page = (
+            page.order_by(Report.updated_at.desc(), Report.id.desc())
+            .limit(limit + 1)
+            .subquery()
+        )
+
+        result = await self.db.execute(
+            select(
+                page,
+                func.count(func.distinct(Chapter.id)).label("chapter_count"),
+                func.count(Section.id).label("section_count"),
+                func.coalesce(func.sum(Section.word_count), 0).label("total_words")
+            )
+            .select_from(page)
+            .outerjoin(Chapter, Chapter.report_id == page.c.id)
+            .outerjoin(Section, Section.chapter_id == Chapter.id)
+            .group_by(*page.c)
+            .order_by(page.c.updated_at.desc(), page.c.id.desc())
+        )
+        rows = result.mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_report_cursor(rows[-1]["updated_at"], rows[-1]["id"])
+
+        logger.debug(f"Found {len(rows)} report summaries for user ID: {user_id}")
+        return [ReportSummary.model_validate(dict(row)) for row in rows], next_cursor
+
+    async def get_report_fingerprint(self, report_id: UUID, user_id: UUID) -> tuple:
+        """
+        One-query summary of everything a report read returns: the report's
+        updated_at plus, for its chapters, sections and references, their
+        count and a digest of every row's id and change marker. Sections are
+        marked by their version, which every write bumps; chapters and
+        references by updated_at. Any edit, insert or delete in the tree
+        changes it, whatever the clocks of the writers said.
+        """
+        chapters = select(Chapter.id).where(Chapter.report_id == Report.id)
+        sections = select(Section.id).join(Chapter, Section.chapter_id == Chapter.id).where(Chapter.report_id == Report.id)
+        references = select(Reference.id).where(Reference.report_id == Report.id)
+        result = await self.db.execute(
+            select(
+                Report.id,
+                Report.updated_at,
+                chapters.with_only_columns(func.count()).scalar_subquery(),
+                chapters.with_only_columns(_digest(Chapter.id, Chapter.updated_at)).scalar_subquery(),
+                sections.with_only_columns(func.count()).scalar_subquery(),
+                sections.with_only_columns(_digest(Section.id, Section.version)).scalar_subquery(),
+                references.with_only_columns(func.count()).scalar_subquery(),
+                references.with_only_columns(_digest(Reference.id, Reference.updated_at)).scalar_subquery()
+            ).where(Report.id == report_id, Report.user_id == user_id)
+        )
+        fingerprint = result.one_or_none()
+        if fingerprint is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
+        return tuple(fingerprint)
+
+    async def get_chapter_fingerprint(self, report_id: UUID, chapter_id: UUID, user_id: UUID) -> tuple:
+        """Like get_report_fingerprint, for one chapter and its sections"""
+        sections = select(Section.id).where(Section.chapter_id == Chapter.id)
+        result = await self.db.execute(
+            select(
+                Chapter.id,
+                Chapter.updated_at,
+                sections.with_only_columns(func.count()).scalar_subquery(),
+                sections.with_only_columns(_digest(Section.id, Section.version)).scalar_subquery()
+            )
+            .join(Report, Chapter.report_id == Report.id)
+            .where(Chapter.id == chapter_id, Chapter.report_id == report_id, Report.user_id == user_id)
+        )
+        fingerprint = result.one_or_none()
+        if fingerprint is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+        return tuple(fingerprint)
+
+    async def get_chapter(self, report_id: UUID, chapter_id: UUID, user_id: UUID, include_content: bool = True) -> Chapter:
+        """
+        Get a chapter with its sections, checking report ownership in the same query.
+        Section content columns are deferred when include_content is False.
+        """
+        logger.debug(f"Getting chapter {chapter_id} of report {report_id}, user ID: {user_id}")
+        result = await self.db.execute(
+            select(Chapter)
+            .join(Report, Chapter.report_id == Report.id)
+            .options(_with_content(selectinload(Chapter.sections), include_content))
+            .where(
+                Chapter.id == chapter_id,
+                Chapter.report_id == report_id,
+                Report.user_id == user_id
+            )
+        )
+        chapter = result.scalar_one_or_none()
+
+        if not chapter:
+            logger.error(f"Chapter not found with ID: {chapter_id}, report ID: {report_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Chapter not found"
+            )
+        return chapter
+
+    async def create_report(self, report_in: ReportCreate, user_id: UUID, institution: Optional[str] = None) -> Report:
+        """Create a new report laid out from the template for its institution and department"""
         try:
             logger.debug(f"Creating report with title: {report_in.title}, department: {report_in.department}")
-            
+            template = template_registry.resolve(institution, report_in.department)
+
             # Create report
             db_report = Report(
                 title=report_in.title,
                 department=report_in.department,
                 user_id=user_id,
+                template_key=template.key,
+                template_version=template.version,
                 status=ReportStatus.DRAFT.value  # Use .value to get string
             )
             self.db.add(db_report)
             
             try:
-                self.db.flush()  # Get report ID without committing
+                await self.db.flush()  # Get report ID without committing
                 logger.debug(f"Created report with ID: {db_report.id}")
             except Exception as flush_error:
                 logger.error(f"Error during flush: {str(flush_error)}")
                 raise
 
-            # Create predefined chapters
-            chapters = [
-                {"number": 1, "title": "INTRODUCTION"},
-                {"number": 2, "title": "LITERATURE REVIEW"},
-                {"number": 3, "title": "METHODOLOGY AND PRESENTATION OF INTERNSHIP ACTIVITIES"},
-                {"number": 4, "title": "PRESENTATION, ANALYSIS AND INTERPRETATION OF DATA"},
-                {"number": 5, "title": "SUMMARY OF FINDINGS, CONCLUSION AND RECOMMENDATIONS"}
-            ]
+            # Insert all chapters in one multi-row INSERT ... RETURNING
+            result = await self.db.execute(
+                insert(Chapter).returning(Chapter.id, Chapter.chapter_number),
+                [
+                    {"report_id": db_report.id, "chapter_number": number, "title": title}
+                    for number, title in template.chapter_rows
+                ]
+            )
+            chapter_ids = {row.chapter_number: row.id for row in result}
+            logger.debug(f"Created {len(chapter_ids)} chapters")
 
-            for chapter_data in chapters:
-                try:
-                    chapter = Chapter(
-                        report_id=db_report.id,
-                        chapter_number=chapter_data["number"],
-                        title=chapter_data["title"]
-                    )
-                    self.db.add(chapter)
-                    self.db.flush()
-                    logger.debug(f"Created chapter {chapter_data['number']}: {chapter_data['title']}")
-
-                    # Create sections based on chapter number
-                    sections = self._get_chapter_sections(chapter_data["number"])
-                    for section_data in sections:
-                        section = Section(
-                            chapter_id=chapter.id,
-                            section_number=section_data["number"],
-                            title=section_data["title"],
-                            level=section_data.get("level", 1)
-                        )
-                        self.db.add(section)
-                        
-                except Exception as chapter_error:
-                    logger.error(f"Error creating chapter {chapter_data['number']}: {str(chapter_error)}")
-                    raise
+            # Insert every section of every chapter in one batched INSERT
+            section_rows = [
+                {
+                    "chapter_id": chapter_ids[chapter_number],
+                    "section_number": section_number,
+                    "title": title,
+                    "level": level
+                }
+                for chapter_number, section_number, title, level in template.section_rows
+            ]
+            await self.db.execute(insert(Section), section_rows)
+            logger.debug(f"Created {len(section_rows)} sections")
 
             try:
-                self.db.commit()
-                self.db.refresh(db_report)
+                await self.db.commit()
                 logger.debug("Successfully committed report and all related entities")
-                return db_report
+                return await self.get_report(db_report.id, user_id)
             except Exception as commit_error:
                 logger.error(f"Error during commit: {str(commit_error)}")
                 raise
             
         except Exception as e:
             logger.error(f"Error creating report: {str(e)}")
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error creating report: {str(e)}"
             )
 
-    def _get_chapter_sections(self, chapter_number: int) -> List[dict]:
-        """Get predefined sections for each chapter"""
-        logger.debug(f"Getting sections for chapter number: {chapter_number}")
-        sections_map = {
-            1: [  # Chapter 1 sections
-                {"number": "1.1", "title": "Background of the study", "level": 1},
-                {"number": "1.1.1", "title": "Historical background", "level": 2},
-                {"number": "1.1.2", "title": "Theoretical background", "level": 2},
-                {"number": "1.1.3", "title": "Conceptual background", "level": 2},
-                {"number": "1.1.4", "title": "Contextual background", "level": 2},
-                {"number": "1.2", "title": "Problem Statement", "level": 1},
-                {"number": "1.3", "title": "Research Objectives", "level": 1},
-                {"number": "1.3.1", "title": "Main Research Objective", "level": 2},
-                {"number": "1.3.2", "title": "Specific Research Objectives", "level": 2},
-                {"number": "1.4", "title": "Research Questions", "level": 1},
-                {"number": "1.4.1", "title": "Main Research Questions", "level": 2},
-                {"number": "1.4.2", "title": "Specific Research Questions", "level": 2},
-                {"number": "1.5", "title": "Justification of the study", "level": 1},
-                {"number": "1.6", "title": "Signification of the study", "level": 1},
-                {"number": "1.7", "title": "Scope of the study", "level": 1},
-                {"number": "1.8", "title": "Limitation of the study", "level": 1},
-                {"number": "1.9", "title": "Definition of terms", "level": 1}
-            ],
-            2: [  # Chapter 2 sections
-                {"number": "2.1", "title": "Reviews by Theory", "level": 1},
-                {"number": "2.2", "title": "Reviews by concept", "level": 1},
-                {"number": "2.3", "title": "Other Reviews", "level": 1}
-            ],
-            3: [  # Chapter 3 sections
-                {"number": "3.1", "title": "Research design", "level": 1},
-                {"number": "3.2", "title": "Population, sample size and techniques", "level": 1},
-                {"number": "3.3", "title": "Sources of data collection", "level": 1},
-                {"number": "3.4", "title": "Method of data analysis", "level": 1},
-                {"number": "3.5", "title": "Internship activities", "level": 1},
-                {"number": "3.6", "title": "Difficulties in carrying out assigned tasks", "level": 1},
-                {"number": "3.7", "title": "Skills Acquired", "level": 1}
-            ],
-            4: [  # Chapter 4 sections
-                {"number": "4.1", "title": "Data Presentation", "level": 1},
-                {"number": "4.2", "title": "Data Analysis", "level": 1},
-                {"number": "4.3", "title": "Interpretation of Results", "level": 1}
-            ],
-            5: [  # Chapter 5 sections
-                {"number": "5.1", "title": "Summary of Findings", "level": 1},
-                {"number": "5.2", "title": "Conclusion", "level": 1},
-                {"number": "5.3", "title": "Recommendations", "level": 1}
-            ]
-        }
-        logger.debug(f"Found {len(sections_map.get(chapter_number, []))} sections for chapter number: {chapter_number}")
-        return sections_map.get(chapter_number, [])
-
-    def update_report(self, report_id: UUID, user_id: UUID, report_in: ReportUpdate) -> Report:
+    async def update_report(self, report_id: UUID, user_id: UUID, report_in: ReportUpdate) -> Report:
         """Update an existing report"""
         logger.debug(f"Updating report with ID: {report_id}, user ID: {user_id}")
-        report = self.get_report(report_id, user_id)
+        report = await self.get_report(report_id, user_id)
         
         update_data = report_in.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(report, field, value)
             
         try:
-            self.db.commit()
-            self.db.refresh(report)
+            await self.db.commit()
             logger.debug(f"Successfully updated report with ID: {report_id}, user ID: {user_id}")
             return report
         except Exception as e:
             logger.error(f"Error updating report: {str(e)}")
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error updating report: {str(e)}"
             )
 
-    def delete_report(self, report_id: UUID, user_id: UUID) -> None:
+    async def delete_report(self, report_id: UUID, user_id: UUID) -> None:
         """Delete a report and all its associated data"""
         logger.debug(f"Deleting report with ID: {report_id}, user ID: {user_id}")
-        report = self.get_report(report_id, user_id)
-        if not report:
+        owned = await self.db.execute(
+            select(Report.id).where(Report.id == report_id, Report.user_id == user_id)
+        )
+        if owned.scalar_one_or_none() is None:
             logger.error(f"Report not found with ID: {report_id}, user ID: {user_id}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Report not found"
             )
-        
+
+        # One set-based DELETE per table, children first. The ORM cascade would
+        # load the whole tree and delete versioned sections one row at a time.
+        chapter_ids = select(Chapter.id).where(Chapter.report_id == report_id)
+        section_ids = select(Section.id).where(Section.chapter_id.in_(chapter_ids))
         try:
-            self.db.delete(report)  # This will cascade delete chapters and sections
-            self.db.commit()
+            await self.db.execute(delete(FileUpload).where(FileUpload.section_id.in_(section_ids)))
+            await self.db.execute(delete(SectionRevision).where(SectionRevision.section_id.in_(section_ids)))
+            await self.db.execute(delete(Section).where(Section.chapter_id.in_(chapter_ids)))
+            await self.db.execute(delete(Chapter).where(Chapter.report_id == report_id))
+            await self.db.execute(delete(Reference).where(Reference.report_id == report_id))
+            await self.db.execute(delete(Report).where(Report.id == report_id))
+            await self.db.commit()
+            report_cache.invalidate_report(report_id)
             logger.debug(f"Successfully deleted report with ID: {report_id}, user ID: {user_id}")
             return {"message": "Report deleted successfully"}
         except Exception as e:
             logger.error(f"Error deleting report: {str(e)}")
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error deleting report: {str(e)}"
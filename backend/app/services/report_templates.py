@@ -0,0 +1,142 @@
+"""
+Report template registry.
+
+Report layouts (chapters and their sections) live in JSON files under
+app/templates/reports, or REPORT_TEMPLATES_DIR when set. A template can be
+tied to an institution, a department or both, and carries a version so
+new layouts can be introduced without touching reports created earlier.
+
+Files are read once (at startup via the lifespan hook, or on first use)
+and compiled into immutable row tuples that ReportService bulk-inserts
+directly, so report creation never rebuilds the layout.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "reports"
+
+class _SectionSpec(BaseModel):
+    number: str
+    title: str
+    level: int = 1
+
+class _ChapterSpec(BaseModel):
+    number: int
+    title: str
+    sections: List[_SectionSpec] = []
+
+class _TemplateSpec(BaseModel):
+    """Shape of a template data file"""
+    key: str
+    version: int = Field(..., ge=1)
+    description: Optional[str] = None
+    institution: Optional[str] = None
+    department: Optional[str] = None
+    chapters: List[_ChapterSpec]
+
+    @model_validator(mode="after")
+    def check_numbering(self):
+        chapter_numbers = [chapter.number for chapter in self.chapters]
+        if len(set(chapter_numbers)) != len(chapter_numbers):
+            raise ValueError("chapter numbers must be unique")
+        section_numbers = [section.number for chapter in self.chapters for section in chapter.sections]
+        if len(set(section_numbers)) != len(section_numbers):
+            raise ValueError("section numbers must be unique")
+        return self
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template flattened into insert-ready rows.
+    chapter_rows:  (chapter_number, title)
+    section_rows:  (chapter_number, section_number, title, level)
+    """
+    key: str
+    version: int
+    institution: Optional[str]
+    department: Optional[str]
+    chapter_rows: Tuple[Tuple[int, str], ...]
+    section_rows: Tuple[Tuple[int, str, str, int], ...]
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    return value.strip().casefold() if value else None
+
+def compile_template(spec: _TemplateSpec) -> CompiledTemplate:
+    """Flatten a parsed template into immutable row tuples"""
+    return CompiledTemplate(
+        key=spec.key,
+        version=spec.version,
+        institution=spec.institution,
+        department=spec.department,
+        chapter_rows=tuple((chapter.number, chapter.title) for chapter in spec.chapters),
+        section_rows=tuple(
+            (chapter.number, section.number, section.title, section.level)
+            for chapter in spec.chapters
+            for section in chapter.sections
+        )
+    )
+
+class TemplateRegistry:
+    """Compiled templates indexed by (institution, department)"""
+
+    def __init__(self):
+        self._templates: Dict[Tuple[str, int], CompiledTemplate] = {}
+        self._latest: Dict[Tuple[Optional[str], Optional[str]], CompiledTemplate] = {}
+        self.loaded = False
+
+    def load(self, directory: Optional[Path] = None) -> None:
+        """Read and compile every *.json template in `directory`"""
+        directory = Path(directory or settings.REPORT_TEMPLATES_DIR or DEFAULT_TEMPLATES_DIR)
+        templates: Dict[Tuple[str, int], CompiledTemplate] = {}
+        for path in sorted(directory.glob("*.json")):
+            try:
+                spec = _TemplateSpec.model_validate(json.loads(path.read_text(encoding="utf-8")))
+            except (ValueError, ValidationError) as e:
+                raise ValueError(f"Invalid report template {path.name}: {e}") from e
+            if (spec.key, spec.version) in templates:
+                raise ValueError(f"Duplicate report template {spec.key} v{spec.version} in {path.name}")
+            templates[(spec.key, spec.version)] = compile_template(spec)
+
+        latest: Dict[Tuple[Optional[str], Optional[str]], CompiledTemplate] = {}
+        for template in sorted(templates.values(), key=lambda t: t.version):
+            latest[(_normalize(template.institution), _normalize(template.department))] = template
+
+        if (None, None) not in latest:
+            raise ValueError(f"No catch-all report template (without institution or department) in {directory}")
+
+        self._templates = templates
+        self._latest = latest
+        self.loaded = True
+        logger.info(f"Loaded {len(templates)} report templates from {directory}")
+
+    def resolve(self, institution: Optional[str] = None, department: Optional[str] = None) -> CompiledTemplate:
+        """
+        Pick the newest template for a report, most specific match first:
+        institution + department, institution, department, then the default.
+        """
+        if not self.loaded:
+            self.load()
+        institution, department = _normalize(institution), _normalize(department)
+        for candidate in ((institution, department), (institution, None), (None, department), (None, None)):
+            template = self._latest.get(candidate)
+            if template is not None:
+                return template
+        raise LookupError("No report template available")
+
+    def get(self, key: str, version: int) -> Optional[CompiledTemplate]:
+        """Get a specific template version, e.g. the one a report was created from"""
+        if not self.loaded:
+            self.load()
+        return self._templates.get((key, version))
+
+template_registry = TemplateRegistry()
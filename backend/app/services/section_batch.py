@@ -0,0 +1,182 @@
+"""
+Batch section updates.
+
+Applies content updates and resets to many sections in one transaction,
+with a fixed number of statements however many sections are involved:
+
+1. one SELECT for the ownership, version and current content of every
+   section;
+2. one UPDATE ... FROM (VALUES ...) RETURNING for all changed sections.
+   It matches each row on the version read in step 1, so a section another
+   request changed in the meantime is reported as a conflict, and the
+   RETURNING rows say exactly which sections were written;
+3. one SELECT for the latest revisions of the written sections and one
+   batched INSERT of their new revisions (see record_revisions). If a
+   concurrent write makes this fail, the whole batch is rolled back and
+   the items it would have updated are reported as conflicts.
+
+The UPDATE bypasses the unit of work. It therefore bumps `version` and
+sets `updated_at` itself (so ETags and report fingerprints change), and
+invalidates the report cache and starts the read-your-writes window
+explicitly.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+import logging
+
+from sqlalchemy import Boolean, Integer, Text, case, column, null, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.report_cache import report_cache
+from app.db.routing import write_tracker
+from app.models.chapter import Chapter
+from app.models.enums import RevisionReason
+from app.models.report import Report
+from app.models.section import Section
+from app.schemas.section import SectionBatchAction, SectionBatchItem, SectionBatchStatus
+from app.services.section_revisions import CONTENT_FIELDS, RevisionChange, record_revisions
+
+logger = logging.getLogger(__name__)
+
+sections = Section.__table__
+
+def _result(item: SectionBatchItem, status: SectionBatchStatus, detail: Optional[str] = None, row=None) -> dict:
+    return {
+        "section_id": item.section_id,
+        "status": status,
+        "version": row.version if row is not None else None,
+        "word_count": row.word_count if row is not None else None,
+        "updated_at": row.updated_at if row is not None else None,
+        "detail": detail
+    }
+
+async def apply_section_batch(db: AsyncSession, user_id: UUID, items: List[SectionBatchItem]) -> List[dict]:
+    """Apply a batch and return one result per item, in request order"""
+    results: List[Optional[dict]] = [None] * len(items)
+    occurrences = Counter(item.section_id for item in items)
+    for index, item in enumerate(items):
+        if occurrences[item.section_id] > 1:
+            results[index] = _result(item, SectionBatchStatus.INVALID, "Section appears more than once in the batch")
+        elif item.action == SectionBatchAction.CONTENT and item.content is None:
+            results[index] = _result(item, SectionBatchStatus.INVALID, "content is required for the content action")
+
+    # 1. Ownership, version and current content of every section, in one query
+    section_ids = [item.section_id for index, item in enumerate(items) if results[index] is None]
+    current = {}
+    if section_ids:
+        result = await db.execute(
+            select(
+                Section.id, Section.version, Section.source_type, Section.word_count, Section.updated_at,
+                *(getattr(Section, field) for field in CONTENT_FIELDS),
+                Chapter.report_id, Report.user_id
+            )
+            .join(Chapter, Section.chapter_id == Chapter.id)
+            .join(Report, Chapter.report_id == Report.id)
+            .where(Section.id.in_(section_ids))
+        )
+        current = {row.id: row for row in result}
+
+    planned: Dict[UUID, tuple] = {}
+    for index, item in enumerate(items):
+        if results[index] is not None:
+            continue
+        row = current.get(item.section_id)
+        if row is None:
+            results[index] = _result(item, SectionBatchStatus.NOT_FOUND, "Section not found")
+        elif row.user_id != user_id:
+            results[index] = _result(item, SectionBatchStatus.FORBIDDEN, "Not authorized to access this section")
+        elif item.base_version is not None and item.base_version != row.version:
+            results[index] = _result(
+                item, SectionBatchStatus.CONFLICT,
+                f"Section is at version {row.version}, not {item.base_version}", row
+            )
+        else:
+            previous = {field: getattr(row, field) for field in CONTENT_FIELDS}
+            if item.action == SectionBatchAction.RESET:
+                state = {field: None for field in CONTENT_FIELDS}
+                word_count = 0
+            else:
+                state = {"user_content": item.content, "ai_content": row.ai_content, "final_content": item.content}
+                word_count = len(item.content.split())
+            if state == previous and word_count == row.word_count:
+                results[index] = _result(item, SectionBatchStatus.UNCHANGED, row=row)
+            else:
+                planned[item.section_id] = (index, item, row, previous, state, word_count)
+
+    # 2. One UPDATE for every changed section
+    if planned:
+        batch = values(
+            column("id", PostgresUUID(as_uuid=True)),
+            column("version", Integer),
+            column("content", Text),
+            column("reset", Boolean),
+            column("word_count", Integer),
+            name="batch"
+        ).data([
+            (section_id, row.version, state["user_content"], item.action == SectionBatchAction.RESET, word_count)
+            for section_id, (_, item, row, _, state, word_count) in planned.items()
+        ])
+        result = await db.execute(
+            update(sections)
+            .where(sections.c.id == batch.c.id, sections.c.version == batch.c.version)
+            .values(
+                user_content=batch.c.content,
+                final_content=batch.c.content,
+                ai_content=case((batch.c.reset, null()), else_=sections.c.ai_content),
+                citations=case((batch.c.reset, null()), else_=sections.c.citations),
+                word_count=batch.c.word_count,
+                version=sections.c.version + 1,
+                updated_at=datetime.utcnow()
+            )
+            .returning(sections.c.id, sections.c.version, sections.c.word_count, sections.c.updated_at)
+        )
+        written = {row.id: row for row in result}
+
+        # 3. Revisions of the sections actually written
+        changes, reasons = [], []
+        for section_id, (index, item, row, previous, state, word_count) in planned.items():
+            updated = written.get(section_id)
+            if updated is None:
+                results[index] = _result(
+                    item, SectionBatchStatus.CONFLICT, "Section was modified by another request; reload it and retry"
+                )
+                continue
+            results[index] = _result(item, SectionBatchStatus.UPDATED, row=updated)
+            changes.append(RevisionChange(
+                section_id=section_id,
+                previous=previous,
+                state=state,
+                source_type=row.source_type,
+                word_count=word_count,
+                previous_source_type=row.source_type,
+                previous_word_count=row.word_count or 0
+            ))
+            reasons.append(RevisionReason.RESET if item.action == SectionBatchAction.RESET else RevisionReason.EDIT)
+        try:
+            await record_revisions(db, changes, reasons)
+            await db.commit()
+        except (StaleDataError, IntegrityError):
+            # E.g. a concurrent write took the next revision number: nothing was saved
+            await db.rollback()
+            for index, item, *_ in planned.values():
+                if results[index]["status"] == SectionBatchStatus.UPDATED:
+                    results[index] = _result(
+                        item, SectionBatchStatus.CONFLICT, "Section was modified by another request; reload it and retry"
+                    )
+            logger.warning(f"Batch of {len(planned)} section updates rolled back after a concurrent write")
+            return results
+    else:
+        await db.commit()
+
+    if planned:
+        write_tracker.mark(user_id)
+        for report_id in {planned[section_id][2].report_id for section_id in planned}:
+            report_cache.invalidate_report(report_id)
+        logger.info(f"Batch updated {sum(1 for r in results if r['status'] == SectionBatchStatus.UPDATED)} sections")
+    return results
@@ -0,0 +1,363 @@
+"""
+Section revision history.
+
+Every write that changes a section's content (edit, generate, reset,
+restore) saves the resulting state of user_content, ai_content and
+final_content as a SectionRevision. To keep storage and write I/O low,
+most revisions are stored as a line-level delta against the latest full
+snapshot, and both kinds are zlib-compressed. A new snapshot is taken every
+SECTION_REVISION_SNAPSHOT_INTERVAL revisions, or earlier once the delta
+stops being clearly smaller than a snapshot. Because deltas are taken
+against the snapshot, not the previous revision, any revision is rebuilt
+from at most two rows (read in one query) with a single delta application.
+
+The first revision of a section that already has content also records
+that earlier content (reason "baseline"), so the write that introduced
+history does not destroy it.
+
+compact_revisions keeps the newest SECTION_REVISION_KEEP revisions of each
+section. When it deletes a snapshot that remaining deltas depend on, the
+oldest remaining revision becomes the new snapshot and the others are
+rebased onto it. run_revision_compactor repeats that in the background.
+"""
+
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import zlib
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.db.session import get_sessionmaker
+from app.models.enums import RevisionReason
+from app.models.section import Section
+from app.models.section_revision import SectionRevision
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FIELDS = ("user_content", "ai_content", "final_content")
+
+# Arbitrary application-wide key, so only one worker compacts at a time
+_COMPACTION_LOCK_KEY = 0x5EC7_1017
+
+State = Dict[str, Optional[str]]
+
+def _pack(payload: Any) -> bytes:
+    return zlib.compress(orjson.dumps(payload), settings.SECTION_REVISION_COMPRESSION_LEVEL)
+
+def _unpack(data: bytes) -> Any:
+    return orjson.loads(zlib.decompress(data))
+
+def make_delta(base: str, target: str) -> List[Any]:
+    """
+    Line-level delta turning `base` into `target`: a list of [start, end]
+    ranges of base lines to copy and literal strings to insert.
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    delta: List[Any] = []
+    matcher = SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append("".join(target_lines[j1:j2]))
+    return delta
+
+def apply_delta(base: str, delta: List[Any]) -> str:
+    """Inverse of make_delta"""
+    base_lines = base.splitlines(keepends=True)
+    return "".join(
+        "".join(base_lines[item[0]:item[1]]) if isinstance(item, list) else item
+        for item in delta
+    )
+
+def _normalize(state: State) -> Dict[str, Any]:
+    """Stored form of a state: final_content becomes a reference when it duplicates another field"""
+    for source in ("user_content", "ai_content"):
+        if state["final_content"] is not None and state["final_content"] == state[source]:
+            return {**state, "final_content": None, "final_from": source}
+    return {**state, "final_from": None}
+
+def _denormalize(stored: Dict[str, Any]) -> State:
+    state = {field: stored[field] for field in CONTENT_FIELDS}
+    if stored["final_from"] is not None:
+        state["final_content"] = state[stored["final_from"]]
+    return state
+
+def _state_delta(snapshot: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta between two stored (normalized) states"""
+    delta = {
+        field: None if stored[field] is None else make_delta(snapshot[field] or "", stored[field])
+        for field in CONTENT_FIELDS
+    }
+    delta["final_from"] = stored["final_from"]
+    return delta
+
+def _apply_state_delta(snapshot: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    stored = {
+        field: None if delta[field] is None else apply_delta(snapshot[field] or "", delta[field])
+        for field in CONTENT_FIELDS
+    }
+    stored["final_from"] = delta["final_from"]
+    return stored
+
+def _decode(is_snapshot: bool, data: bytes, snapshot_data: Optional[bytes]) -> Dict[str, Any]:
+    """Stored state of a revision row"""
+    if is_snapshot:
+        return _unpack(data)
+    return _apply_state_delta(_unpack(snapshot_data), _unpack(data))
+
+def section_state(section: Section) -> State:
+    """The content fields of a section as they will be saved"""
+    return {field: getattr(section, field) for field in CONTENT_FIELDS}
+
+def _committed_value(section: Section, field: str) -> Any:
+    """Value of an attribute before the changes pending on the section"""
+    history = inspect(section).attrs[field].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+def _with_snapshot():
+    """Revision rows together with the data of the snapshot each is based on"""
+    snapshot = aliased(SectionRevision)
+    return (
+        select(SectionRevision, snapshot.data)
+        .outerjoin(
+            snapshot,
+            (snapshot.section_id == SectionRevision.section_id)
+            & (snapshot.revision_number == SectionRevision.base_number)
+        )
+    )
+
+def _revision_with_snapshot(section_id: UUID):
+    return _with_snapshot().where(SectionRevision.section_id == section_id)
+
+@dataclass
+class RevisionChange:
+    """A content change of one section, from `previous` to `state`"""
+    section_id: UUID
+    previous: State
+    state: State
+    source_type: Any
+    word_count: int
+    previous_source_type: Any = None
+    previous_word_count: int = 0
+
+def _new_revision(
+    section_id: UUID,
+    number: int,
+    state: State,
+    reason: RevisionReason,
+    snapshot: Optional[Tuple[int, Dict[str, Any]]],
+    source_type: Any,
+    word_count: Optional[int]
+) -> SectionRevision:
+    """
+    Build a revision row for `state`, as a delta against the stored
+    `snapshot` (number, stored state) when that pays off
+    """
+    stored = _normalize(state)
+    full = _pack(stored)
+    is_snapshot = True
+    data = full
+    if snapshot is not None and number - snapshot[0] < settings.SECTION_REVISION_SNAPSHOT_INTERVAL:
+        delta = _pack(_state_delta(snapshot[1], stored))
+        if len(delta) * 2 < len(full):
+            is_snapshot, data = False, delta
+    return SectionRevision(
+        section_id=section_id,
+        revision_number=number,
+        is_snapshot=is_snapshot,
+        base_number=None if is_snapshot else snapshot[0],
+        data=data,
+        reason=reason.value,
+        source_type=source_type,
+        word_count=word_count or 0
+    )
+
+def _plan_revisions(change: RevisionChange, latest_row, reason: RevisionReason) -> List[SectionRevision]:
+    """Revision rows for a change, given the section's latest revision row (or None)"""
+    revisions = []
+    if latest_row is None:
+        if change.previous == change.state:
+            return revisions
+        number, snapshot = 1, None
+        if any(change.previous.values()):
+            revisions.append(_new_revision(
+                change.section_id, 1, change.previous, RevisionReason.BASELINE, None,
+                change.previous_source_type, change.previous_word_count
+            ))
+            number, snapshot = 2, (1, _normalize(change.previous))
+    else:
+        latest, snapshot_data = latest_row
+        latest_stored = _decode(latest.is_snapshot, latest.data, snapshot_data)
+        if _denormalize(latest_stored) == change.state:
+            return revisions
+        number = latest.revision_number + 1
+        if latest.is_snapshot:
+            snapshot = (latest.revision_number, latest_stored)
+        else:
+            snapshot = (latest.base_number, _unpack(snapshot_data))
+
+    revisions.append(_new_revision(
+        change.section_id, number, change.state, reason, snapshot, change.source_type, change.word_count
+    ))
+    return revisions
+
+async def record_revision(db: AsyncSession, section: Section, reason: RevisionReason) -> Optional[SectionRevision]:
+    """
+    Add a revision for the section's pending content to the session (the
+    caller commits). Costs one SELECT; nothing is added when the content
+    equals the latest revision.
+    """
+    result = await db.execute(
+        _revision_with_snapshot(section.id).order_by(SectionRevision.revision_number.desc()).limit(1)
+    )
+    change = RevisionChange(
+        section_id=section.id,
+        previous={field: _committed_value(section, field) for field in CONTENT_FIELDS},
+        state=section_state(section),
+        source_type=section.source_type,
+        word_count=section.word_count,
+        previous_source_type=_committed_value(section, "source_type"),
+        previous_word_count=_committed_value(section, "word_count") or 0
+    )
+    revisions = _plan_revisions(change, result.first(), reason)
+    db.add_all(revisions)
+    return revisions[-1] if revisions else None
+
+async def record_revisions(db: AsyncSession, changes: List[RevisionChange], reasons: List[RevisionReason]) -> int:
+    """
+    Bulk form of record_revision, for changes written with Core statements
+    or whose previous state only the caller knows: one SELECT for the latest revision of every section, and the new rows
+    go out in one batched INSERT at the next flush. Returns the number of
+    revision rows added.
+    """
+    if not changes:
+        return 0
+    result = await db.execute(
+        _with_snapshot()
+        .where(SectionRevision.section_id.in_([change.section_id for change in changes]))
+        .order_by(SectionRevision.section_id, SectionRevision.revision_number.desc())
+        .distinct(SectionRevision.section_id)
+    )
+    latest = {row[0].section_id: row for row in result.all()}
+    revisions = []
+    for change, reason in zip(changes, reasons):
+        revisions.extend(_plan_revisions(change, latest.get(change.section_id), reason))
+    db.add_all(revisions)
+    return len(revisions)
+
+async def list_revisions(db: AsyncSession, section_id: UUID, limit: int = 50, before: Optional[int] = None) -> List[dict]:
+    """Revision metadata, newest first, without decoding any content"""
+    statement = (
+        select(
+            SectionRevision.revision_number,
+            SectionRevision.reason,
+            SectionRevision.source_type,
+            SectionRevision.word_count,
+            SectionRevision.is_snapshot,
+            func.length(SectionRevision.data).label("stored_bytes"),
+            SectionRevision.created_at
+        )
+        .where(SectionRevision.section_id == section_id)
+        .order_by(SectionRevision.revision_number.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        statement = statement.where(SectionRevision.revision_number < before)
+    result = await db.execute(statement)
+    return [dict(row) for row in result.mappings()]
+
+async def get_revision(db: AsyncSession, section_id: UUID, revision_number: int) -> Tuple[SectionRevision, State]:
+    """A revision and its rebuilt content, 404 if it does not exist"""
+    result = await db.execute(
+        _revision_with_snapshot(section_id).where(SectionRevision.revision_number == revision_number)
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Revision not found")
+    revision, snapshot_data = row
+    return revision, _denormalize(_decode(revision.is_snapshot, revision.data, snapshot_data))
+
+async def _compact_section(db: AsyncSession, section_id: UUID, latest_number: int, keep: int) -> int:
+    cutoff = latest_number - keep
+    result = await db.execute(
+        _revision_with_snapshot(section_id)
+        .where(
+            SectionRevision.revision_number > cutoff,
+            SectionRevision.is_snapshot.is_(False),
+            SectionRevision.base_number <= cutoff
+        )
+        .order_by(SectionRevision.revision_number)
+    )
+    dependents = result.all()
+    if dependents:
+        # The oldest kept revision becomes the snapshot the others are rebased onto
+        first, snapshot_data = dependents[0]
+        old_snapshot = _unpack(snapshot_data)
+        new_snapshot = _apply_state_delta(old_snapshot, _unpack(first.data))
+        first.is_snapshot, first.base_number, first.data = True, None, _pack(new_snapshot)
+        for revision, _ in dependents[1:]:
+            state = _apply_state_delta(old_snapshot, _unpack(revision.data))
+            revision.base_number = first.revision_number
+            revision.data = _pack(_state_delta(new_snapshot, state))
+        await db.flush()
+
+    deleted = await db.execute(
+        delete(SectionRevision).where(
+            SectionRevision.section_id == section_id,
+            SectionRevision.revision_number <= cutoff
+        )
+    )
+    return deleted.rowcount
+
+async def compact_revisions(db: AsyncSession, keep: Optional[int] = None, max_sections: int = 100) -> int:
+    """
+    Drop all but the newest `keep` revisions of up to `max_sections` sections
+    and return how many rows were deleted. Skips the run if another worker
+    holds the compaction lock.
+    """
+    keep = settings.SECTION_REVISION_KEEP if keep is None else keep
+    locked = await db.scalar(select(func.pg_try_advisory_xact_lock(_COMPACTION_LOCK_KEY)))
+    if not locked:
+        await db.rollback()
+        return 0
+
+    result = await db.execute(
+        select(SectionRevision.section_id, func.max(SectionRevision.revision_number))
+        .group_by(SectionRevision.section_id)
+        .having(func.count() > keep)
+        .limit(max_sections)
+    )
+    deleted = 0
+    for section_id, latest_number in result.all():
+        deleted += await _compact_section(db, section_id, latest_number, keep)
+    await db.commit()
+    if deleted:
+        logger.info(f"Compacted section revisions: deleted {deleted} rows")
+    return deleted
+
+async def run_revision_compactor() -> None:
+    """Compact revisions every SECTION_REVISION_COMPACT_INTERVAL_SECONDS until cancelled"""
+    while True:
+        await asyncio.sleep(settings.SECTION_REVISION_COMPACT_INTERVAL_SECONDS)
+        try:
+            async with get_sessionmaker()() as db:
+                await compact_revisions(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Section revision compaction failed: {str(e)}", exc_info=True)
@@ -0,0 +1,80 @@
+"""
+Apply text edits to section content and keep its word count current.
+
+An edit replaces the characters [start, end) of the base text with `text`.
+Offsets are Python string indices (Unicode code points) into the base text
+the client last saw, and edits must be sorted and must not overlap.
+
+The word count is updated incrementally. Each edit's range is widened to the
+whitespace around it; ranges that touch are merged; and only the words
+inside those windows are recounted. Text outside every window is unchanged
+and separated from the windows by whitespace, so the result always equals
+`len(new_text.split())` without rescanning the whole section.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from app.schemas.section import TextEdit
+
+class InvalidEdit(ValueError):
+    """The edits do not fit the base text"""
+
+def _validate(base: str, edits: Sequence[TextEdit]) -> None:
+    previous_end = 0
+    for index, edit in enumerate(edits):
+        if edit.start > edit.end:
+            raise InvalidEdit(f"Edit {index}: start is after end")
+        if edit.end > len(base):
+            raise InvalidEdit(f"Edit {index}: range ends past the end of the text ({len(base)} characters)")
+        if edit.start < previous_end:
+            raise InvalidEdit(f"Edit {index}: edits must be sorted and must not overlap")
+        previous_end = edit.end
+
+def _word_windows(base: str, edits: Sequence[TextEdit]) -> List[Tuple[int, int, List[TextEdit]]]:
+    """Edit ranges widened to whitespace boundaries, merged where they touch"""
+    windows: List[Tuple[int, int, List[TextEdit]]] = []
+    for edit in edits:
+        start, end = edit.start, edit.end
+        while start > 0 and not base[start - 1].isspace():
+            start -= 1
+        while end < len(base) and not base[end].isspace():
+            end += 1
+        if windows and start <= windows[-1][1]:
+            previous_start, _, grouped = windows[-1]
+            grouped.append(edit)
+            windows[-1] = (previous_start, end, grouped)
+        else:
+            windows.append((start, end, [edit]))
+    return windows
+
+def _splice(base: str, start: int, end: int, edits: Sequence[TextEdit]) -> str:
+    """base[start:end] with `edits` (all inside it) applied"""
+    parts = []
+    position = start
+    for edit in edits:
+        parts.append(base[position:edit.start])
+        parts.append(edit.text)
+        position = edit.end
+    parts.append(base[position:end])
+    return "".join(parts)
+
+def apply_edits(base: str, edits: Sequence[TextEdit], word_count: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Apply `edits` to `base` and return (new_text, new_word_count).
+    `word_count` is the stored count for `base`; when it is None the count
+    is computed from scratch.
+    """
+    _validate(base, edits)
+    if word_count is None:
+        word_count = len(base.split())
+
+    parts = []
+    position = 0
+    for start, end, grouped in _word_windows(base, edits):
+        replaced = _splice(base, start, end, grouped)
+        word_count += len(replaced.split()) - len(base[start:end].split())
+        parts.append(base[position:start])
+        parts.append(replaced)
+        position = end
+    parts.append(base[position:])
+    return "".join(parts), word_count
@@ -0,0 +1,93 @@
+"""
+Event-loop responsiveness during a login burst.
+
+`--concurrency` clients log in as fast as they can for `--duration` seconds
+while one probe client polls the cheap GET /health/db-pool endpoint. When
+bcrypt runs on the event loop the probe latency climbs to the length of the
+login queue; with hashing on the password pool it should stay flat. Logins
+rejected with 503 (password pool full) are counted separately.
+
+    uvicorn app.main:app --workers 1
+    python benchmarks/bench_login_burst.py --base-url http://localhost:8000 \
+        --concurrency 50 --duration 20
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from common import print_latency_report
+
+
+async def _register(client: httpx.AsyncClient, api: str) -> dict:
+    credentials = {"email": f"bench-{uuid.uuid4().hex[:12]}@example.com", "password": "benchmark-password"}
+    response = await client.post(f"{api}/users/register", json={
+        **credentials,
+        "full_name": "Bench Mark",
+        "level": "BSc",
+        "institution": "Benchmark University"
+    })
+    response.raise_for_status()
+    return credentials
+
+
+async def _login_worker(client: httpx.AsyncClient, api: str, credentials: dict, deadline: float, latencies: list, errors: list, rejected: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post(f"{api}/users/login", json=credentials)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code == 503:
+            rejected.append(response.headers.get("retry-after"))
+        elif response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def _probe(client: httpx.AsyncClient, api: str, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(f"{api}/health/db-pool")
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+        await asyncio.sleep(0.05)
+
+
+async def run(base_url: str, concurrency: int, duration: float) -> None:
+    api = f"{base_url.rstrip('/')}/api/v1"
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        credentials = await _register(client, api)
+
+        login_latencies: list = []
+        login_errors: list = []
+        rejected: list = []
+        probe_latencies: list = []
+        probe_errors: list = []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            _probe(client, api, deadline, probe_latencies, probe_errors),
+            *(
+                _login_worker(client, api, credentials, deadline, login_latencies, login_errors, rejected)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    print("== logins ==")
+    print_latency_report(login_latencies, login_errors, elapsed)
+    print(f"rejected:    {len(rejected)} (503, password pool full)")
+    print("== probe (GET /health/db-pool) ==")
+    print_latency_report(probe_latencies, probe_errors, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency, args.duration))
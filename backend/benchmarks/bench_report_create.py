@@ -0,0 +1,65 @@
+"""
+Concurrent POST /reports latency benchmark.
+
+Report creation materialises the whole chapter/section skeleton, which is
+the hot path during sign-up bursts at the start of a semester. Run against
+a live server:
+
+    uvicorn app.main:app --workers 1
+    python benchmarks/bench_report_create.py --base-url http://localhost:8000 \
+        --concurrency 20 --requests 500
+
+Each client creates reports back to back until `--requests` reports have
+been created in total.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import print_latency_report, register_and_login
+
+
+async def _worker(client: httpx.AsyncClient, url: str, headers: dict, remaining: list, latencies: list, errors: list):
+    while remaining:
+        remaining.pop()
+        start = time.perf_counter()
+        response = await client.post(
+            url,
+            json={"title": "Benchmark report", "department": "Computer Science"},
+            headers=headers
+        )
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 201:
+            errors.append(response.status_code)
+
+
+async def run(base_url: str, concurrency: int, requests: int) -> None:
+    api = f"{base_url.rstrip('/')}/api/v1"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        headers = await register_and_login(client, api)
+        url = f"{api}/reports/"
+
+        remaining = list(range(requests))
+        latencies: list = []
+        errors: list = []
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(client, url, headers, remaining, latencies, errors)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print_latency_report(latencies, errors, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency, args.requests))
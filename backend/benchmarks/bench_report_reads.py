@@ -0,0 +1,71 @@
+"""
+Concurrent GET /reports/{id} throughput benchmark.
+
+Run it against a live server to compare two builds, e.g. the sync-session
+build and the async-session build, each served by a single uvicorn worker:
+
+    uvicorn app.main:app --workers 1
+    python benchmarks/bench_report_reads.py --base-url http://localhost:8000 \
+        --concurrency 50 --duration 20
+
+The script registers a throwaway user, creates one report and then hammers
+that report from `--concurrency` clients for `--duration` seconds.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import print_latency_report, register_and_login
+
+
+async def _prepare(client: httpx.AsyncClient, api: str) -> tuple[dict, str]:
+    """Register a user, log in and create the report that will be read"""
+    headers = await register_and_login(client, api)
+    response = await client.post(
+        f"{api}/reports/",
+        json={"title": "Benchmark report", "department": "Computer Science"},
+        headers=headers
+    )
+    response.raise_for_status()
+    return headers, response.json()["id"]
+
+
+async def _worker(client: httpx.AsyncClient, url: str, headers: dict, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def run(base_url: str, concurrency: int, duration: float) -> None:
+    api = f"{base_url.rstrip('/')}/api/v1"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        headers, report_id = await _prepare(client, api)
+        url = f"{api}/reports/{report_id}"
+
+        latencies: list = []
+        errors: list = []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(client, url, headers, deadline, latencies, errors)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print_latency_report(latencies, errors, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency, args.duration))
@@ -0,0 +1,120 @@
+"""
+In-process benchmark of report response serialization.
+
+Builds a synthetic report shaped like the default template (5 chapters,
+33 sections) with realistic section text and a reference list, as detached
+ORM objects, and times turning it into response bytes:
+
+    fastapi   FastAPI's default path: serialize_response (validate against
+              response_model, dump to JSON-compatible data) + JSONResponse
+    orjson    app.core.serialization.orjson_response (precompiled
+              TypeAdapter, one validation pass, orjson encoding)
+
+Run from the backend directory so `app` is importable:
+
+    python benchmarks/bench_report_serialization.py --iterations 300
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.core.serialization import orjson_response  # noqa: E402
+from app.models import Chapter, Reference, Report, Section  # noqa: E402
+from app.models.enums import ContentSourceType  # noqa: E402
+from app.schemas.report import ReportResponse  # noqa: E402
+from app.services.report_templates import template_registry  # noqa: E402
+
+WORDS = (
+    "internship organisation department analysis network system data report supervisor "
+    "students training software development process management results findings study "
+    "implementation evaluation methodology objectives industrial experience practical"
+).split()
+
+
+def _paragraphs(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return "\n\n".join(text[i:i + 600] for i in range(0, len(text), 600))
+
+
+def build_report(words_per_section: int, references: int) -> Report:
+    """A detached Report with every chapter, section and reference populated"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    template = template_registry.resolve()
+    report = Report(
+        id=uuid.uuid4(), title="Synthetic report", department="Computer Science", status="draft",
+        user_id=uuid.uuid4(), created_at=now, updated_at=now,
+        template_key=template.key, template_version=template.version
+    )
+    chapters = {}
+    for number, title in template.chapter_rows:
+        chapters[number] = Chapter(
+            id=uuid.uuid4(), report_id=report.id, chapter_number=number, title=title,
+            created_at=now, updated_at=now
+        )
+        report.chapters.append(chapters[number])
+    for chapter_number, section_number, title, level in template.section_rows:
+        content = _paragraphs(rng, words_per_section)
+        chapters[chapter_number].sections.append(Section(
+            id=uuid.uuid4(), chapter_id=chapters[chapter_number].id, section_number=section_number,
+            title=title, level=level, user_content=content, ai_content=content, final_content=content,
+            source_type=ContentSourceType.AI_GENERATED, word_count=words_per_section, version=1,
+            created_at=now, updated_at=now
+        ))
+    for i in range(references):
+        report.references.append(Reference(
+            id=uuid.uuid4(), report_id=report.id, citation_key=f"Author{i}2023", reference_type="article",
+            authors=["Author, A.", "Writer, B."], year=2023, title=f"Study number {i}",
+            journal="Journal of Things", volume="12", issue="3", pages="1-20",
+            created_at=now, updated_at=now
+        ))
+    return report
+
+
+def _time(label: str, func, iterations: int) -> float:
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = func()
+    per_call = (time.perf_counter() - start) / iterations
+    print(f"{label:8} {per_call * 1000:8.2f} ms/response   {len(body) / 1024:8.1f} KiB")
+    return per_call
+
+
+def main(iterations: int, words_per_section: int, references: int) -> None:
+    report = build_report(words_per_section, references)
+    field = create_model_field(name="Response_get_report", type_=ReportResponse, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=report))
+        return JSONResponse(content).body
+
+    def orjson_path() -> bytes:
+        return orjson_response(ReportResponse, report).body
+
+    print(f"5 chapters / 33 sections, {words_per_section} words per section field, {references} references")
+    baseline = _time("fastapi", fastapi_default, iterations)
+    fast = _time("orjson", orjson_path, iterations)
+    print(f"speedup  {baseline / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--words-per-section", type=int, default=400)
+    parser.add_argument("--references", type=int, default=30)
+    args = parser.parse_args()
+    main(args.iterations, args.words_per_section, args.references)
@@ -0,0 +1,31 @@
+"""Shared helpers for the HTTP benchmarks in this directory"""
+
+import statistics
+import uuid
+
+import httpx
+
+
+async def register_and_login(client: httpx.AsyncClient, api: str) -> dict:
+    """Register a throwaway user and return Authorization headers for it"""
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    password = "benchmark-password"
+    await client.post(f"{api}/users/register", json={
+        "email": email,
+        "password": password,
+        "full_name": "Bench Mark",
+        "level": "BSc",
+        "institution": "Benchmark University"
+    })
+    response = await client.post(f"{api}/users/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def print_latency_report(latencies: list, errors: list, elapsed: float) -> None:
+    """Print request count, throughput and latency percentiles"""
+    latencies = sorted(latencies)
+    print(f"requests:    {len(latencies)} ({len(errors)} errors)")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p99: {latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000:.1f} ms")
@@ -0,0 +1,47 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.services import autosave
+from app.services.autosave import autosave_buffer
+
+from .conftest import API, sections_of
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def section_id(report) -> str:
+    section_id = sections_of(report)[0]["id"]
+    yield section_id
+    autosave_buffer._pending.pop(UUID(section_id), None)
+
+@pytest.fixture
+def racing_write(monkeypatch):
+    """Every flush loses a race with another write of the section"""
+    async def write(section_id, entry):
+        raise StaleDataError("section was updated concurrently")
+    monkeypatch.setattr(autosave, "_write", write)
+
+async def test_failed_flush_does_not_fail_reads(client, auth_headers, section_id, racing_write, monkeypatch):
+    monkeypatch.setattr(autosave_buffer, "window_seconds", 60)
+    response = await client.put(f"{API}/sections/{section_id}/autosave", json={"content": "typing"}, headers=auth_headers)
+    assert response.status_code == 202
+
+    response = await client.get(f"{API}/sections/{section_id}/content", headers=auth_headers)
+    assert response.status_code == 200
+    # Still buffered, so the flusher writes it on a later tick
+    assert autosave_buffer.pending(UUID(section_id)).content == "typing"
+
+async def test_write_through_conflict_returns_409(client, auth_headers, section_id, racing_write, monkeypatch):
+    monkeypatch.setattr(autosave_buffer, "window_seconds", 0)
+    response = await client.put(f"{API}/sections/{section_id}/autosave", json={"content": "typing"}, headers=auth_headers)
+    assert response.status_code == 409
+    assert autosave_buffer.pending(UUID(section_id)) is None
+
+async def test_write_through_saves_content(client, auth_headers, section_id, monkeypatch):
+    monkeypatch.setattr(autosave_buffer, "window_seconds", 0)
+    response = await client.put(f"{API}/sections/{section_id}/autosave", json={"content": "typing"}, headers=auth_headers)
+    assert response.status_code == 200
+    response = await client.get(f"{API}/sections/{section_id}/content", headers=auth_headers)
+    assert response.json()["final_content"] == "typing"
@@ -0,0 +1,235 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import delete, update
+
+from app.core import content_generation
+from app.core.config import settings
+from app.core.content_generation import GenerationProvider, register_provider
+from app.db.session import get_sessionmaker
+from app.models.generation_job import GenerationJob
+from app.models.section import Section
+from app.services import generation_jobs
+from app.services.generation_jobs import GenerationWorkerPool, JobLost
+
+from .conftest import API, sections_of
+
+pytestmark = pytest.mark.anyio
+
+class CountingProvider(GenerationProvider):
+    """
+    Records how many calls overlap; calls wait for `release` when it is set,
+    and fail when `error` is set
+    """
+    name = "test"
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.error = None
+        self.started = asyncio.Event()
+        self.release = None
+
+    async def generate(self, context):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.started.set()
+        try:
+            await (self.release.wait() if self.release else asyncio.sleep(0.05))
+            if self.error:
+                raise RuntimeError(self.error)
+            return f"Generated {context['section_title']}"
+        finally:
+            self.running -= 1
+
+@pytest.fixture
+async def provider(client):
+    """A registered test provider, with the queue emptied of other tests' jobs"""
+    async with get_sessionmaker()() as db:
+        await db.execute(delete(GenerationJob))
+        await db.commit()
+    provider = CountingProvider()
+    register_provider(provider)
+    yield provider
+    content_generation._providers.pop(provider.name)
+
+def pool(workers: int = 1, limit: int = 2) -> GenerationWorkerPool:
+    return GenerationWorkerPool(workers=workers, default_limit=limit, limits={}, poll_seconds=0.05)
+
+async def enqueue(client, auth_headers, section: dict) -> UUID:
+    response = await client.post(f"{API}/sections/{section['id']}/generate?provider=test", headers=auth_headers)
+    assert response.status_code == 202, response.text
+    return UUID(response.json()["id"])
+
+async def job_row(job_id: UUID) -> GenerationJob:
+    async with get_sessionmaker()() as db:
+        return await db.get(GenerationJob, job_id)
+
+async def test_section_has_one_active_job(client, auth_headers, report, provider):
+    url = f"{API}/sections/{sections_of(report)[0]['id']}/generate"
+    first = await client.post(url, headers=auth_headers)
+    second = await client.post(url, headers=auth_headers)
+    assert first.status_code == second.status_code == 202
+    assert first.json()["id"] == second.json()["id"]
+    assert first.headers["Location"].endswith(first.json()["id"])
+
+async def test_enqueue_inserts_again_when_the_active_job_finished(client, auth_headers, report, provider, monkeypatch):
+    url = f"{API}/sections/{sections_of(report)[0]['id']}/generate"
+    first = (await client.post(url, headers=auth_headers)).json()
+    get_active_job = generation_jobs.get_active_job
+    finished = []
+
+    async def finish_first(db, section_id):
+        # The blocking job completes between the insert and the lookup
+        if not finished:
+            finished.append(section_id)
+            await db.execute(
+                update(GenerationJob)
+                .where(GenerationJob.section_id == section_id)
+                .values(status="succeeded")
+            )
+            return None
+        return await get_active_job(db, section_id)
+    monkeypatch.setattr(generation_jobs, "get_active_job", finish_first)
+
+    response = await client.post(url, headers=auth_headers)
+    assert response.status_code == 202, response.text
+    assert response.json()["id"] != first["id"]
+    assert response.json()["status"] == "queued"
+
+async def test_enqueue_gives_up_with_409_when_the_section_stays_contended(client, auth_headers, report, provider, monkeypatch):
+    url = f"{API}/sections/{sections_of(report)[0]['id']}/generate"
+    await client.post(url, headers=auth_headers)
+
+    async def never_found(db, section_id):
+        return None
+    monkeypatch.setattr(generation_jobs, "get_active_job", never_found)
+
+    response = await client.post(url, headers=auth_headers)
+    assert response.status_code == 409
+
+async def test_workers_save_results_within_the_provider_limit(client, auth_headers, report, provider):
+    job_ids = [await enqueue(client, auth_headers, section) for section in sections_of(report)[:3]]
+    workers = pool(workers=3, limit=1)
+    workers.start()
+    try:
+        for _ in range(100):
+            jobs = [await job_row(job_id) for job_id in job_ids]
+            if all(job.status == "succeeded" for job in jobs):
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await workers.stop()
+    assert [job.status for job in jobs] == ["succeeded"] * 3
+    assert provider.peak == 1
+
+    response = await client.get(f"{API}/sections/{jobs[0].section_id}/content", headers=auth_headers)
+    assert response.json()["final_content"] == jobs[0].result
+    assert response.json()["version"] == jobs[0].section_version
+
+async def test_providers_at_their_limit_are_not_claimed(client, auth_headers, report, provider):
+    for section in sections_of(report)[:2]:
+        await enqueue(client, auth_headers, section)
+    provider.release = asyncio.Event()
+    workers = pool(limit=1)
+    first = await workers._claim()
+    processing = asyncio.create_task(workers._process(first))
+    await asyncio.wait_for(provider.started.wait(), 5)
+    assert workers.semaphore("test").locked()
+    assert await workers._claim() is None
+    provider.release.set()
+    await processing
+    second = await workers._claim()
+    assert second is not None and second.id != first.id
+
+async def test_jobs_with_an_expired_lease_are_claimed_again(client, auth_headers, report, provider, monkeypatch):
+    section = sections_of(report)[0]
+    job_id = await enqueue(client, auth_headers, section)
+    workers = pool()
+    lost = await workers._claim()
+    assert await workers._claim() is None  # Still leased
+
+    async with get_sessionmaker()() as db:
+        started_at = datetime.utcnow() - timedelta(seconds=settings.GENERATION_LEASE_SECONDS + 1)
+        await db.execute(update(GenerationJob).where(GenerationJob.id == job_id).values(started_at=started_at))
+        await db.commit()
+    reclaimed = await workers._claim()
+    assert reclaimed.id == job_id
+    assert (lost.attempts, reclaimed.attempts) == (1, 2)
+
+    # The worker that lost the lease can no longer save
+    content_url = f"{API}/sections/{section['id']}/content"
+    version = (await client.get(content_url, headers=auth_headers)).json()["version"]
+    with pytest.raises(JobLost):
+        await generation_jobs._save_result(lost, "stale content", version)
+    response = await client.get(content_url, headers=auth_headers)
+    assert response.json()["final_content"] != "stale content"
+    await workers._process(reclaimed)
+    assert (await job_row(job_id)).status == "succeeded"
+
+async def test_results_do_not_overwrite_edits_made_during_generation(client, auth_headers, report, provider):
+    section = sections_of(report)[0]
+    content_url = f"{API}/sections/{section['id']}/content"
+    job_id = await enqueue(client, auth_headers, section)
+    provider.release = asyncio.Event()
+    workers = pool()
+    processing = asyncio.create_task(workers._process(await workers._claim()))
+    await asyncio.wait_for(provider.started.wait(), 5)
+    response = await client.post(content_url, json={"content": "typed meanwhile"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    provider.release.set()
+    await processing
+
+    job = await job_row(job_id)
+    assert (job.status, job.attempts, job.section_version) == ("conflicted", 1, None)
+    assert job.result == f"Generated {section['title']}"
+    response = await client.get(content_url, headers=auth_headers)
+    assert response.json()["final_content"] == "typed meanwhile"
+    assert response.json()["ai_content"] is None
+
+async def test_writes_racing_the_save_leave_the_job_conflicted(client, auth_headers, report, provider, monkeypatch):
+    section = sections_of(report)[0]
+    job_id = await enqueue(client, auth_headers, section)
+    record_revision = generation_jobs.record_revision
+
+    async def write_first(db, *args):
+        # Another writer commits between the version check and the UPDATE
+        async with get_sessionmaker()() as other:
+            await other.execute(
+                update(Section).where(Section.id == section["id"]).values(version=Section.version + 1)
+            )
+            await other.commit()
+        return await record_revision(db, *args)
+    monkeypatch.setattr(generation_jobs, "record_revision", write_first)
+
+    workers = pool()
+    await workers._process(await workers._claim())
+    job = await job_row(job_id)
+    assert (job.status, job.attempts) == ("conflicted", 1)  # Not retried
+    assert job.result is not None
+    response = await client.get(f"{API}/sections/{section['id']}/content", headers=auth_headers)
+    assert response.json()["ai_content"] is None
+
+async def test_failed_attempts_back_off_then_fail(client, auth_headers, report, provider, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "GENERATION_RETRY_DELAY_SECONDS", 30)
+    provider.error = "provider down"
+    job_id = await enqueue(client, auth_headers, sections_of(report)[0])
+    workers = pool()
+
+    before = datetime.utcnow()
+    await workers._process(await workers._claim())
+    job = await job_row(job_id)
+    assert (job.status, job.attempts, job.error) == ("queued", 1, "provider down")
+    assert before + timedelta(seconds=30) <= job.run_after <= datetime.utcnow() + timedelta(seconds=30)
+    assert await workers._claim() is None  # Not due yet
+
+    async with get_sessionmaker()() as db:
+        await db.execute(update(GenerationJob).where(GenerationJob.id == job_id).values(run_after=datetime.utcnow()))
+        await db.commit()
+    await workers._process(await workers._claim())
+    job = await job_row(job_id)
+    assert (job.status, job.attempts) == ("failed", 2)
+    assert job.finished_at is not None
@@ -0,0 +1,31 @@
+"""
+Index coverage of the hot lookups, checked with EXPLAIN on a database built
+by the migrations (see app.db.check_indexes).
+"""
+
+import json
+import uuid
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, text
+
+from app.db.check_indexes import EXPECTED_INDEXES, _plan_indexes
+
+from .conftest import alembic_config
+
+@pytest.fixture
+def migrated_engine(empty_database):
+    command.upgrade(alembic_config(), "head")
+    engine = create_engine(empty_database)
+    yield engine
+    engine.dispose()
+
+@pytest.mark.parametrize("index_name, query", EXPECTED_INDEXES, ids=[name for name, _ in EXPECTED_INDEXES])
+def test_lookup_uses_index(migrated_engine, index_name, query):
+    with migrated_engine.connect() as connection:
+        # As in check_indexes: the result must not depend on table size
+        connection.execute(text("SET enable_seqscan = off"))
+        raw = connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), {"id": uuid.uuid4()}).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        assert index_name in _plan_indexes(plan)
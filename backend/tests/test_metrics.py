@@ -0,0 +1,22 @@
+import pytest
+
+from app.core import metrics
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+def requests_total(route: str, status: str) -> float:
+    return metrics.REQUESTS.labels("GET", route, status)._value.get()
+
+@pytest.mark.parametrize("path", ["/docs", f"{settings.API_V1_STR}/openapi.json"])
+async def test_framework_routes_are_labelled_with_their_path(client, path):
+    before = requests_total(path, "200")
+    response = await client.get(path)
+    assert response.status_code == 200
+    assert requests_total(path, "200") == before + 1
+
+async def test_unknown_paths_share_one_label(client):
+    before = requests_total(metrics.UNMATCHED_ROUTE, "404")
+    response = await client.get("/no/such/path")
+    assert response.status_code == 404
+    assert requests_total(metrics.UNMATCHED_ROUTE, "404") == before + 1
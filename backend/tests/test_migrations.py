@@ -0,0 +1,31 @@
+"""
+The migration history, run against an empty database.
+"""
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+from app.db.base_class import Base
+
+from .conftest import alembic_config
+
+def test_upgrade_head_builds_the_schema_of_the_models(empty_database):
+    command.upgrade(alembic_config(), "head")
+
+    engine = create_engine(empty_database)
+    with engine.connect() as connection:
+        differences = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    engine.dispose()
+    assert differences == []
+
+def test_downgrade_base_removes_everything(empty_database):
+    command.upgrade(alembic_config(), "head")
+    command.downgrade(alembic_config(), "base")
+
+    engine = create_engine(empty_database)
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
+
+    command.upgrade(alembic_config(), "head")
@@ -0,0 +1,42 @@
+from uuid import UUID
+
+import pytest
+
+from app.core.principal_cache import principal_cache
+from app.db.session import get_sessionmaker
+from app.models.user import User
+
+from .conftest import API
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def user_id(client, auth_headers) -> str:
+    response = await client.get(f"{API}/users/me", headers=auth_headers)
+    return response.json()["id"]
+
+async def test_entry_is_dropped_when_the_change_commits(client, user_id):
+    async with get_sessionmaker()() as db:
+        user = await db.get(User, UUID(user_id))
+        user.full_name = "Renamed"
+        await db.flush()
+        # A concurrent request caching the row between flush and commit
+        principal_cache.put(user_id, user)
+        await db.commit()
+    assert principal_cache.get(user_id) is None
+
+async def test_entry_is_kept_when_the_change_rolls_back(client, user_id):
+    async with get_sessionmaker()() as db:
+        user = await db.get(User, UUID(user_id))
+        principal_cache.put(user_id, user)
+        user.full_name = "Renamed"
+        await db.flush()
+        await db.rollback()
+    assert principal_cache.get(user_id) is not None
+
+async def test_profile_update_is_visible_on_the_next_request(client, auth_headers):
+    await client.get(f"{API}/users/me", headers=auth_headers)  # Caches the principal
+    response = await client.put(f"{API}/users/me", json={"full_name": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    response = await client.get(f"{API}/users/me", headers=auth_headers)
+    assert response.json()["full_name"] == "Renamed"
@@ -0,0 +1,105 @@
+"""
+Statement counts of the hot endpoints.
+
+Each route declares a budget with deps.query_budget; in strict mode the
+query budget middleware turns an exceeded budget into a 500. These tests
+run with strict mode on and also compare each request's statement count
+with the maximum its endpoint is allowed.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.api import deps
+from app.core.config import settings
+
+from .conftest import API, sections_of
+
+pytestmark = pytest.mark.anyio
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """Statements executed by any engine inside the block"""
+    statements: List[str] = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+
+async def request(client, method, url, budget, **kwargs):
+    with count_queries() as statements:
+        response = await client.request(method, url, **kwargs)
+    assert response.status_code < 400, response.text
+    assert len(statements) <= budget, f"{method} {url}: {len(statements)} > {budget}:\n" + "\n".join(statements)
+    return response, len(statements)
+
+async def test_report_reads_stay_within_budget(client, auth_headers, report, strict):
+    report_id = report["id"]
+    chapter_id = report["chapters"][0]["id"]
+    await request(client, "GET", f"{API}/reports/", 5, headers=auth_headers)
+    await request(client, "GET", f"{API}/reports/summaries", 2, headers=auth_headers)
+    await request(client, "GET", f"{API}/reports/{report_id}", 6, headers=auth_headers)
+    await request(client, "GET", f"{API}/reports/{report_id}?include=content&exclude=references", 6, headers=auth_headers)
+    await request(client, "GET", f"{API}/reports/{report_id}/chapters/{chapter_id}", 4, headers=auth_headers)
+    await request(client, "GET", f"{API}/references/report/{report_id}", 3, headers=auth_headers)
+
+async def test_section_endpoints_stay_within_budget(client, auth_headers, report, strict):
+    section_id = sections_of(report)[0]["id"]
+    response, _ = await request(client, "POST", f"{API}/sections/{section_id}/content", 6, json={"content": "first draft"}, headers=auth_headers)
+    patch = {"base_version": response.json()["version"], "edits": [{"start": 0, "end": 5, "text": "second"}]}
+    await request(client, "PATCH", f"{API}/sections/{section_id}/content", 6, json=patch, headers=auth_headers)
+    await request(client, "GET", f"{API}/sections/{section_id}/content", 2, headers=auth_headers)
+    await request(client, "POST", f"{API}/sections/{section_id}/reset", 6, headers=auth_headers)
+    await request(client, "GET", f"{API}/sections/{section_id}/revisions", 3, headers=auth_headers)
+    await request(client, "GET", f"{API}/sections/{section_id}/revisions/1", 3, headers=auth_headers)
+    await request(client, "POST", f"{API}/sections/{section_id}/revisions/1/restore", 7, headers=auth_headers)
+    await request(client, "GET", f"{API}/sections/{section_id}/files", 2, headers=auth_headers)
+
+async def test_report_writes_stay_within_budget(client, auth_headers, strict):
+    response, _ = await request(client, "POST", f"{API}/reports/", 8, json={"title": "T", "department": "CS"}, headers=auth_headers)
+    await request(client, "DELETE", f"{API}/reports/{response.json()['id']}", 8, headers=auth_headers)
+
+async def test_counts_do_not_grow_with_report_size(client, auth_headers, report, strict):
+    """The tree is loaded with a fixed number of statements however much of it has content"""
+    url = f"{API}/reports/{report['id']}?include=content"
+    _, before = await request(client, "GET", url, 5, headers=auth_headers)
+    for section in sections_of(report)[:10]:
+        await client.post(f"{API}/sections/{section['id']}/content", json={"content": "text"}, headers=auth_headers)
+    _, after = await request(client, "GET", url, 5, headers=auth_headers)
+    assert after == before
+
+@pytest.fixture
+def over_budget_route():
+    """A throwaway route that issues two statements against a budget of one"""
+    from app.main import app
+
+    @app.get("/__test/over-budget", dependencies=[deps.query_budget(1)])
+    async def over_budget(db=Depends(deps.get_db)):
+        await db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    yield "/__test/over-budget"
+    app.router.routes[:] = [route for route in app.router.routes if getattr(route, "path", None) != "/__test/over-budget"]
+
+async def test_strict_mode_fails_requests_over_budget(client, over_budget_route, strict):
+    response = await client.get(over_budget_route)
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Query budget exceeded: 2 > 1"
+
+async def test_budgets_are_only_reported_outside_strict_mode(client, over_budget_route, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+    response = await client.get(over_budget_route)
+    assert response.status_code == 200
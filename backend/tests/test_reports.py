@@ -0,0 +1,78 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy import update
+
+from app.core.report_cache import report_cache
+from app.db.session import get_sessionmaker
+from app.models.section import Section
+
+from .conftest import API, sections_of
+
+pytestmark = pytest.mark.anyio
+
+async def test_report_read_returns_references_by_default(client, auth_headers, report):
+    url = f"{API}/reports/{report['id']}"
+
+    response = await client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    assert "references" in response.json()
+    assert "final_content" not in response.json()["chapters"][0]["sections"][0]
+
+    response = await client.get(url, params={"exclude": "references"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert "references" not in response.json()
+
+async def test_report_read_variants_have_their_own_etags(client, auth_headers, report):
+    url = f"{API}/reports/{report['id']}"
+    default = await client.get(url, headers=auth_headers)
+    trimmed = await client.get(url, params={"exclude": "references"}, headers=auth_headers)
+    assert default.headers["ETag"] != trimmed.headers["ETag"]
+    response = await client.get(url, params={"exclude": "references"}, headers={**auth_headers, "If-None-Match": trimmed.headers["ETag"]})
+    assert response.status_code == 304
+
+async def test_not_modified_for_a_compressed_read_varies_on_accept_encoding(client, auth_headers, report):
+    url = f"{API}/reports/{report['id']}"
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+    response = await client.get(url, headers=headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gzip"')
+
+    response = await client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+async def test_etag_changes_when_a_write_keeps_updated_at(client, auth_headers, report):
+    """Writers with skewed or coarse clocks must not leave a stale ETag behind"""
+    url = f"{API}/reports/{report['id']}"
+    etag = (await client.get(url, headers=auth_headers)).headers["ETag"]
+    section_id = sections_of(report)[0]["id"]
+    async with get_sessionmaker()() as db:
+        await db.execute(
+            update(Section)
+            .where(Section.id == UUID(section_id))
+            .values(final_content="changed", version=Section.version + 1, updated_at=Section.updated_at)
+        )
+        await db.commit()
+    report_cache.clear()  # The bulk UPDATE bypassed the session events, like a write from another process
+
+    response = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+async def test_section_etag_follows_the_version(client, auth_headers, report):
+    url = f"{API}/sections/{sections_of(report)[0]['id']}/content"
+    etag = (await client.get(url, headers=auth_headers)).headers["ETag"]
+    async with get_sessionmaker()() as db:
+        section = await db.get(Section, UUID(sections_of(report)[0]["id"]))
+        await db.execute(
+            update(Section)
+            .where(Section.id == section.id)
+            .values(final_content="changed", version=Section.version + 1, updated_at=section.updated_at)
+        )
+        await db.commit()
+    response = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["final_content"] == "changed"
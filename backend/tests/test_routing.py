@@ -0,0 +1,127 @@
+"""
+Replica routing: RoutingSession.get_bind decisions against stand-in engines,
+then real reads and writes against two databases, the test database as the
+primary and a "<name>_replica" database as the replica. Nothing replicates
+between them, so a row written to the primary is missing on the replica and
+shows which engine served a read.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.engine import make_url
+
+from app.db import session as session_module
+from app.db.routing import WriteTracker
+from app.db.session import RoutingSession, get_sessionmaker
+from app.models.section import Section
+from app.models.user import User
+
+from .conftest import create_database, reset_schema
+
+PRIMARY = SimpleNamespace(sync_engine="primary")
+REPLICA = SimpleNamespace(sync_engine="replica")
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = WriteTracker()
+    monkeypatch.setattr(session_module, "write_tracker", tracker)
+    monkeypatch.setattr(session_module, "get_engine", lambda: PRIMARY)
+    monkeypatch.setattr(session_module, "get_replica_engine", lambda: REPLICA)
+    return tracker
+
+def read_session(user_id=None) -> RoutingSession:
+    session = RoutingSession()
+    session.info["use_replica"] = True
+    session.info["user_id"] = user_id
+    return session
+
+def test_plain_reads_go_to_the_replica(tracker):
+    assert read_session(uuid4()).get_bind(clause=select(Section.id)) == "replica"
+
+def test_sessions_not_opened_for_reads_use_the_primary(tracker):
+    assert RoutingSession().get_bind(clause=select(Section.id)) == "primary"
+
+def test_dml_goes_to_the_primary(tracker):
+    statement = update(Section).where(Section.id == uuid4()).values(title="x")
+    assert read_session(uuid4()).get_bind(clause=statement) == "primary"
+
+def test_flushes_go_to_the_primary(tracker):
+    session = read_session(uuid4())
+    session._flushing = True
+    assert session.get_bind(clause=select(Section.id)) == "primary"
+
+def test_reads_stay_on_the_primary_after_a_write(tracker, monkeypatch):
+    writer, other = uuid4(), uuid4()
+    tracker.mark(writer)
+    assert read_session(writer).get_bind(clause=select(Section.id)) == "primary"
+    assert read_session(other).get_bind(clause=select(Section.id)) == "replica"
+
+    # Back on the replica once the read-your-writes window has passed
+    monkeypatch.setattr(session_module.settings, "READ_YOUR_WRITES_SECONDS", 0)
+    assert read_session(writer).get_bind(clause=select(Section.id)) == "replica"
+
+def test_without_a_replica_everything_uses_the_primary(tracker, monkeypatch):
+    monkeypatch.setattr(session_module, "get_replica_engine", lambda: None)
+    assert read_session(uuid4()).get_bind(clause=select(Section.id)) == "primary"
+
+@pytest.fixture
+async def replica(database, monkeypatch):
+    """Route reads to a second database; returns (primary, replica) database names"""
+    url = make_url(database).set(database=f"{make_url(database).database}_replica")
+    create_database(url)
+    reset_schema(url)
+    await session_module.dispose_engine()
+    monkeypatch.setattr(session_module.settings, "DATABASE_REPLICA_URL", url.render_as_string(hide_password=False))
+    monkeypatch.setattr(session_module, "write_tracker", WriteTracker())
+    yield make_url(database).database, url.database
+    await session_module.dispose_engine()
+
+async def current_database(user_id) -> str:
+    async with get_sessionmaker()() as db:
+        db.info.update(use_replica=True, user_id=user_id)
+        return await db.scalar(text("SELECT current_database()"))
+
+async def find_user(user_id, email: str):
+    async with get_sessionmaker()() as db:
+        db.info.update(use_replica=True, user_id=user_id)
+        return await db.scalar(select(User.id).where(User.email == email))
+
+async def create_user(user_id, email: str) -> None:
+    async with get_sessionmaker()() as db:
+        db.info["user_id"] = user_id
+        db.add(User(id=user_id, email=email, password="x"))
+        await db.commit()
+
+@pytest.mark.anyio
+async def test_reads_run_on_the_replica_and_writes_on_the_primary(replica):
+    primary_name, replica_name = replica
+    user_id, email = uuid4(), f"{uuid4().hex[:12]}@example.com"
+    assert await current_database(user_id) == replica_name
+
+    await create_user(user_id, email)
+    for name, found in ((primary_name, True), (replica_name, False)):
+        engine = create_engine(make_url(session_module.settings.DATABASE_URL).set(database=name))
+        with engine.connect() as connection:
+            row = connection.scalar(text("SELECT id FROM users WHERE email = :email"), {"email": email})
+        engine.dispose()
+        assert (row is not None) == found
+
+@pytest.mark.anyio
+async def test_reads_see_own_writes_until_the_window_passes(replica, monkeypatch):
+    primary_name, replica_name = replica
+    writer, other = uuid4(), uuid4()
+    email = f"{uuid4().hex[:12]}@example.com"
+    await create_user(writer, email)
+
+    # The writer reads from the primary and sees the new row; others still read the replica
+    assert await current_database(writer) == primary_name
+    assert await find_user(writer, email) == writer
+    assert await current_database(other) == replica_name
+    assert await find_user(other, email) is None
+
+    monkeypatch.setattr(session_module.settings, "READ_YOUR_WRITES_SECONDS", 0)
+    assert await current_database(writer) == replica_name
+    assert await find_user(writer, email) is None
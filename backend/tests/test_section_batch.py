@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services import section_batch
+
+from .conftest import API, sections_of
+
+pytestmark = pytest.mark.anyio
+
+async def test_batch_updates_sections(client, auth_headers, report):
+    section_ids = [section["id"] for section in sections_of(report)[:3]]
+    response = await client.post(f"{API}/sections/batch", json={
+        "items": [{"section_id": section_id, "content": "batched"} for section_id in section_ids]
+    }, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [result["status"] for result in response.json()["results"]] == ["updated"] * 3
+
+async def test_batch_reports_conflicts_when_saving_revisions_races(client, auth_headers, report, monkeypatch):
+    async def record_revisions(db, changes, reasons):
+        raise IntegrityError("INSERT INTO section_revisions", {}, Exception("duplicate revision number"))
+    monkeypatch.setattr(section_batch, "record_revisions", record_revisions)
+
+    section_ids = [section["id"] for section in sections_of(report)[:2]]
+    response = await client.post(f"{API}/sections/batch", json={
+        "items": [{"section_id": section_id, "content": "batched"} for section_id in section_ids]
+    }, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [result["status"] for result in response.json()["results"]] == ["conflict"] * 2
+
+    # The section UPDATE was rolled back with the revisions
+    for section_id in section_ids:
+        response = await client.get(f"{API}/sections/{section_id}/content", headers=auth_headers)
+        assert response.json()["final_content"] != "batched"
+        assert response.json()["version"] == 1
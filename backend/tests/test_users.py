@@ -0,0 +1,18 @@
+import pytest
+
+from .conftest import API, sections_of
+
+pytestmark = pytest.mark.anyio
+
+async def test_delete_user_with_revised_sections(client, auth_headers, report):
+    section_id = sections_of(report)[0]["id"]
+    for content in ("first draft", "second draft"):
+        response = await client.post(f"{API}/sections/{section_id}/content", json={"content": content}, headers=auth_headers)
+        assert response.status_code < 400, response.text
+    response = await client.get(f"{API}/sections/{section_id}/revisions", headers=auth_headers)
+    assert len(response.json()) >= 2
+
+    response = await client.delete(f"{API}/users/me", headers=auth_headers)
+    assert response.status_code == 204, response.text
+    response = await client.get(f"{API}/users/me", headers=auth_headers)
+    assert response.status_code in (401, 403, 404)